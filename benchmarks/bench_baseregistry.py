@@ -0,0 +1,454 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Benchmarks for base registries.
+
+Run ``python benchmarks/bench_baseregistry.py --output results.json`` and
+compare the JSON results of different releases.  ``--quick`` uses smaller
+sizes, e.g. to check that the benchmarks still work.
+
+"""
+import argparse
+import io
+import json
+import pickle
+import platform
+import sys
+import time
+import timeit
+import tracemalloc
+import types
+
+import zope.component
+import zope.component.hooks
+import zope.interface
+from zope.configuration import xmlconfig
+from zope.interface.interfaces import IComponents
+from zope.site.folder import Folder
+from zope.site.site import LocalSiteManager
+from zope.testing.cleanup import cleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry.bases import setBases
+
+
+MODULE = '_z3c_baseregistry_bench'
+
+
+class IExample(zope.interface.Interface):
+    pass
+
+
+class IAdapted(zope.interface.Interface):
+    pass
+
+
+@zope.interface.implementer(IExample)
+class Example:
+    pass
+
+
+@zope.component.adapter(IExample)
+@zope.interface.implementer(IAdapted)
+def adapter(context):
+    return context
+
+
+def timeOperation(func, number, repeat=5):
+    """Return the best time per call of ``func`` in seconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def setUp():
+    cleanUp()
+    zope.component.hooks.setHooks()
+    module = types.ModuleType(MODULE)
+    module.IExample = IExample
+    module.IAdapted = IAdapted
+    module.adapter = adapter
+    sys.modules[MODULE] = module
+    return module
+
+
+def tearDown():
+    sys.modules.pop(MODULE, None)
+    zope.component.hooks.resetHooks()
+    cleanUp()
+
+
+def makeRegistries(count, prefix='registry', bases=()):
+    gsm = zope.component.getGlobalSiteManager()
+    registries = []
+    for i in range(count):
+        registry = baseregistry.BaseComponents(
+            gsm, f'{prefix}{i}', bases)
+        gsm.registerUtility(registry, IComponents, registry.__name__)
+        registries.append(registry)
+    return registries
+
+
+def benchRegisterIn(blocks, registrations):
+    """ZCML execution time of ``blocks`` registerIn blocks."""
+    module = setUp()
+    try:
+        for i, registry in enumerate(makeRegistries(blocks)):
+            setattr(module, f'registry{i}', registry)
+        for j in range(registrations):
+            setattr(module, f'example{j}', Example())
+
+        utilities = ''.join(
+            f'<utility component="{MODULE}.example{j}" name="n{j}" />'
+            for j in range(registrations))
+        zcml = ''.join(
+            f'<registerIn registry="{MODULE}.registry{i}">'
+            f'{utilities}'
+            f'<adapter factory="{MODULE}.adapter" />'
+            '</registerIn>'
+            for i in range(blocks))
+        zcml = (
+            '<configure xmlns="http://namespaces.zope.org/zope">'
+            f'{zcml}</configure>')
+        meta = xmlconfig.string('''
+        <configure>
+          <include package="z3c.baseregistry" file="meta.zcml" />
+          <include package="zope.component" file="meta.zcml" />
+        </configure>
+        ''')
+
+        start = time.perf_counter()
+        xmlconfig.string(zcml, context=meta)
+        return {'execute': time.perf_counter() - start}
+    finally:
+        tearDown()
+
+
+def benchLookup(width, depth, number):
+    """Lookup latency through a local site manager's bases.
+
+    The site manager has ``width`` chains of ``depth`` base registries each
+    plus the global registry as bases.  The registrations live in the
+    deepest registry of the last chain.
+    """
+    setUp()
+    try:
+        gsm = zope.component.getGlobalSiteManager()
+        chains = []
+        for w in range(width):
+            bases = ()
+            for d in range(depth):
+                bases = tuple(makeRegistries(1, f'chain{w}-{d}-', bases))
+            chains.append(bases[0])
+
+        deepest = chains[-1]
+        while deepest.__bases__:
+            deepest = deepest.__bases__[0]
+        example = Example()
+        deepest.registerUtility(example, IExample)
+        deepest.registerAdapter(adapter)
+
+        site = Folder()
+        site.setSiteManager(LocalSiteManager(site))
+        sm = site.getSiteManager()
+        sm.__bases__ = tuple(chains) + (gsm,)
+
+        return {
+            'getUtility': timeOperation(
+                lambda: sm.getUtility(IExample), number),
+            'queryUtility-miss': timeOperation(
+                lambda: sm.queryUtility(IAdapted), number),
+            'getAdapter': timeOperation(
+                lambda: sm.getAdapter(example, IAdapted), number),
+        }
+    finally:
+        tearDown()
+
+
+def benchFreeze(number):
+    """Utility lookups in a base registry before and after freezing it."""
+    setUp()
+    try:
+        registry, = makeRegistries(1)
+        registry.registerUtility(Example(), IExample, 'example')
+
+        def lookups(prefix):
+            return {
+                f'{prefix}queryUtility': timeOperation(
+                    lambda: registry.queryUtility(IExample, 'example'),
+                    number),
+                f'{prefix}queryUtility-miss': timeOperation(
+                    lambda: registry.queryUtility(IAdapted), number),
+            }
+
+        values = lookups('')
+        registry.freeze()
+        values.update(lookups('frozen-'))
+        return values
+    finally:
+        tearDown()
+
+
+def benchDelta(tenants, registrations, number):
+    """Delta registries against full base registries for tenants.
+
+    Each of ``tenants`` tenant registries has the shared registry with
+    ``registrations`` named utilities as base and overrides one of them.
+    ``memory`` is the memory allocated per tenant for creating it and
+    looking up all utilities once.
+    """
+    setUp()
+    try:
+        gsm = zope.component.getGlobalSiteManager()
+        shared, = makeRegistries(1, 'shared')
+        for j in range(registrations):
+            shared.registerUtility(Example(), IExample, f'n{j}')
+        values = {}
+        for kind, factory in (
+                ('delta', lambda i: baseregistry.DeltaComponents(
+                    gsm, f'delta{i}', shared)),
+                ('full', lambda i: baseregistry.BaseComponents(
+                    gsm, f'full{i}', (shared,)))):
+            tracemalloc.start()
+            registries = []
+            for i in range(tenants):
+                registry = factory(i)
+                registry.registerUtility(Example(), IExample, 'n0')
+                for j in range(registrations):
+                    registry.queryUtility(IExample, f'n{j}')
+                registries.append(registry)
+            values[f'{kind}-memory'] = (
+                tracemalloc.get_traced_memory()[0] / tenants)
+            tracemalloc.stop()
+            registry = registries[-1]
+            values[f'{kind}-overridden'] = timeOperation(
+                lambda: registry.getUtility(IExample, 'n0'), number)
+            values[f'{kind}-delegated'] = timeOperation(
+                lambda: registry.getUtility(IExample, 'n1'), number)
+        return values
+    finally:
+        tearDown()
+
+
+def benchSetBases(width, depth, count):
+    """Setting the same bases on ``count`` local site managers, one by one
+    and with ``setBases()``.
+
+    The bases are ``width`` chains of ``depth`` base registries each.
+    """
+    setUp()
+    try:
+        gsm = zope.component.getGlobalSiteManager()
+        chains = []
+        for w in range(width):
+            bases = (gsm,)
+            for d in range(depth):
+                bases = tuple(makeRegistries(1, f'chain{w}-{d}-', bases))
+            chains.append(bases[0])
+        chains = tuple(chains)
+        siteManagers = []
+        for i in range(count):
+            site = Folder()
+            site.setSiteManager(LocalSiteManager(site))
+            siteManagers.append(site.getSiteManager())
+
+        def assign():
+            for sm in siteManagers:
+                sm.__bases__ = chains
+
+        def timeChange(change):
+            times = []
+            for i in range(5):
+                for sm in siteManagers:
+                    sm.__bases__ = (gsm,)
+                start = time.perf_counter()
+                change()
+                times.append(time.perf_counter() - start)
+            return min(times) / count
+
+        return {
+            'assign': timeChange(assign),
+            'setBases': timeChange(lambda: setBases(siteManagers, chains)),
+        }
+    finally:
+        tearDown()
+
+
+def benchResolve(number):
+    """Resolution of a base registry by ``BC()`` and by ``BR()``.
+
+    ``getUtility`` is the utility lookup ``BC()`` makes.
+    """
+    setUp()
+    try:
+        gsm = zope.component.getGlobalSiteManager()
+        registry, = makeRegistries(1)
+        name = registry.__name__
+        return {
+            'BC': timeOperation(
+                lambda: baseregistry.BC(gsm, name), number),
+            'getUtility': timeOperation(
+                lambda: gsm.getUtility(IComponents, name), number),
+            'BR': timeOperation(lambda: baseregistry.BR(name), number),
+        }
+    finally:
+        tearDown()
+
+
+def benchPickle(count, number):
+    """``BC()`` pickle and unpickle throughput of base registries."""
+    setUp()
+    try:
+        registries = tuple(makeRegistries(count))
+        jar = pickle.dumps(registries, 2)
+        return {
+            'size': len(jar) / count,
+            'dumps': timeOperation(
+                lambda: pickle.dumps(registries, 2), number) / count,
+            'loads': timeOperation(
+                lambda: pickle.loads(jar), number) / count,
+        }
+    finally:
+        tearDown()
+
+
+class LegacyPickler(pickle.Pickler):
+    """Pickle base registries like earlier versions."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, baseregistry.BaseComponents):
+            return baseregistry.BC, (obj.__parent__, obj.__name__)
+        if isinstance(obj, baseregistry.BaseComponentsAdapterRegistry):
+            return zope.component.globalregistry.GAR, (
+                obj.__parent__, obj.__name__)
+        return NotImplemented
+
+
+def legacyDumps(obj, protocol):
+    f = io.BytesIO()
+    LegacyPickler(f, protocol).dump(obj)
+    return f.getvalue()
+
+
+def benchReferences(count, number):
+    """Size and load throughput of records referencing base registries.
+
+    Each record references a base registry and its adapter registries, like
+    a local site manager and its adapter registries do, once with the
+    compact references and once like earlier versions.
+    """
+    setUp()
+    try:
+        records = [(registry, registry.adapters, registry.utilities)
+                   for registry in makeRegistries(count)]
+        baseregistry.buildReferenceTable()
+        jars = [pickle.dumps(record, 3) for record in records]
+        legacy = [legacyDumps(record, 3) for record in records]
+
+        def loads(jars):
+            return lambda: [pickle.loads(jar) for jar in jars]
+
+        return {
+            'size': sum(map(len, jars)) / count,
+            'legacySize': sum(map(len, legacy)) / count,
+            'loads': timeOperation(loads(jars), number) / count,
+            'legacyLoads': timeOperation(loads(legacy), number) / count,
+        }
+    finally:
+        tearDown()
+
+
+def benchVocabulary(count, number):
+    """Construction of the "Base Components" vocabulary."""
+    try:
+        from z3c.baseregistry.browser.base import BaseComponentsVocabulary
+    except ImportError:
+        return None
+    setUp()
+    try:
+        makeRegistries(count)
+        site = Folder()
+        site.setSiteManager(LocalSiteManager(site))
+        sm = site.getSiteManager()
+        return {'construct': timeOperation(
+            lambda: BaseComponentsVocabulary(sm), number)}
+    finally:
+        tearDown()
+
+
+def run(quick=False):
+    scale = 10 if quick else 1
+    results = []
+
+    def add(name, params, values):
+        results.append({'name': name, 'params': params, 'values': values})
+
+    for blocks, registrations in ((10, 10), (100, 10), (10, 100)):
+        blocks = max(1, blocks // scale)
+        add('registerIn', {'blocks': blocks, 'registrations': registrations},
+            benchRegisterIn(blocks, registrations))
+
+    for width, depth in ((1, 1), (1, 10), (10, 1), (5, 5)):
+        add('lookup', {'width': width, 'depth': depth},
+            benchLookup(width, depth, 10000 // scale))
+
+    add('freeze', {}, benchFreeze(100000 // scale))
+
+    for registrations in (10, 1000):
+        tenants = max(1, 100 // scale)
+        add('delta', {'tenants': tenants, 'registrations': registrations},
+            benchDelta(tenants, registrations, 100000 // scale))
+
+    for width, depth in ((1, 10), (10, 1), (5, 5)):
+        count = max(1, 1000 // scale)
+        add('setBases', {'width': width, 'depth': depth, 'registries': count},
+            benchSetBases(width, depth, count))
+
+    add('resolve', {}, benchResolve(100000 // scale))
+
+    for count in (1, 100):
+        add('pickle', {'registries': count},
+            benchPickle(count, 1000 // scale))
+
+    for count in (1, 100):
+        add('references', {'registries': count},
+            benchReferences(count, 1000 // scale))
+
+    for count in (10, 1000):
+        count = max(1, count // scale)
+        add('vocabulary', {'registries': count},
+            benchVocabulary(count, 100 // scale))
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'unit': 'seconds per operation, pickle sizes in bytes',
+        'results': results,
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='Use small sizes.')
+    parser.add_argument('--output', help='Write the results to this file.')
+    options = parser.parse_args(args)
+
+    output = json.dumps(run(options.quick), indent=2, sort_keys=True)
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
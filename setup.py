@@ -99,16 +99,24 @@ setup(
     extras_require={
         'test': tests_require,
         'zmi': [
+            'transaction',
             'zope.formlib',
         ],
     },
     tests_require=tests_require,
+    entry_points={
+        'console_scripts': [
+            'baseregistry-report = z3c.baseregistry.report:main',
+        ],
+    },
     install_requires=[
         'setuptools',
+        'persistent',
         'zope.component[hook,zcml] >= 4.5.0',
         'zope.configuration >= 4.3.0',
+        'zope.container',
         'zope.i18nmessageid >= 2.2',
-        'zope.interface',
+        'zope.interface >= 5.3.0',
         'zope.schema >= 4.9.0',
         'zope.site',
     ],
@@ -15,22 +15,495 @@
 
 """
 __docformat__ = "reStructuredText"
+import contextlib
+import threading
+
 from zope.component import globalregistry
+from zope.interface.adapter import BaseAdapterRegistry
+from zope.interface.interfaces import ComponentLookupError
 from zope.interface.interfaces import IComponents
 
 
+_EMPTY = {}
+
+
+class FrozenRegistryError(Exception):
+    """A frozen registry cannot be modified."""
+
+
 def BC(components, name):
+    # Not memoized: a hit in any cache kept in Python costs more than the
+    # lookup, which is served from the lookup cache of the parent.
     return components.getUtility(IComponents, name)
 
 
+# Resolved compact references: ``{id: (checks, registry)}``, where the
+# checks are the utility registries of the parents along the id with their
+# generations.
+_brTable = {}
+
+
+def BR(id, attribute=None):
+    # Resolve a reference written by ``BaseComponents.__reduce__()``, see
+    # ``getReferenceId()``.  The resolved registry is valid as long as no
+    # utility was (un)registered in any of its parents or their bases, which
+    # would increase the generation of the utility registry of the parent.
+    cached = _brTable.get(id)
+    if cached is not None:
+        for utilities, generation in cached[0]:
+            if utilities._generation != generation:
+                cached = None
+                break
+    if cached is None:
+        cached = _brTable[id] = _resolveReference(id)
+    registry = cached[1]
+    if attribute is None:
+        return registry
+    return getattr(registry, attribute)
+
+
+def _getCheck(components):
+    return components.utilities, components.utilities._generation
+
+
+def _resolveReference(id):
+    components = globalregistry.base
+    checks = ()
+    for name in (id.split('/') if id else ()):
+        checks += (_getCheck(components),)
+        components = components.getUtility(IComponents, name)
+    return checks, components
+
+
+def getReferenceId(components):
+    """Return the id identifying a global registry, as resolved by ``BR()``.
+
+    This is the name of a base registry and of its parents below the global
+    registry, joined by slashes, or an empty string for the global registry
+    itself.  Return ``None`` for all other registries, e.g. local site
+    managers.
+    """
+    names = []
+    while isinstance(components, BaseComponents):
+        if not components.__name__ or '/' in components.__name__:
+            return None
+        names.append(components.__name__)
+        components = components.__parent__
+    if components is not globalregistry.base:
+        return None
+    return '/'.join(reversed(names))
+
+
+def buildReferenceTable():
+    """Resolve the compact references to all base registries at once.
+
+    Afterwards references to these registries are resolved by a lookup in a
+    table only.  Return the number of resolved references.  Registries
+    nested in registries that are not populated yet are resolved when they
+    are first loaded.
+    """
+    pending = [('', globalregistry.base, ())]
+    count = 0
+    while pending:
+        prefix, components, checks = pending.pop()
+        checks += (_getCheck(components),)
+        for name, registry in components.getUtilitiesFor(IComponents):
+            if (not isinstance(registry, BaseComponents)
+                    or registry.__parent__ is not components
+                    or registry.__name__ != name or '/' in name):
+                continue
+            id = prefix + name
+            _brTable[id] = checks, registry
+            count += 1
+            if registry.populated:
+                pending.append((id + '/', registry, checks))
+    return count
+
+
+def clearReferenceTable():
+    """Clear the table of resolved compact references."""
+    _brTable.clear()
+
+
+class BaseComponentsAdapterRegistry(globalregistry.GlobalAdapterRegistry):
+    """The adapter registry of base components.
+
+    The notification of dependent registries can be deferred while many
+    registrations are made.
+    """
+
+    # Nesting level of bulk operations
+    _bulk = 0
+    # Whether a change happened during the bulk operation
+    _bulkChanged = False
+    # Flattened ``{provided: {name: value}}`` table of utility lookups,
+    # only available when frozen with ``flatten``
+    _lookupTable = None
+    _flatten = False
+    frozen = False
+
+    def beginBulk(self):
+        self._bulk += 1
+
+    def endBulk(self):
+        self._bulk -= 1
+        if not self._bulk and self._bulkChanged:
+            self._bulkChanged = False
+            self.changed(self)
+
+    def changed(self, originally_changed):
+        if not self._bulk:
+            super().changed(originally_changed)
+            if self.frozen:
+                # One of our bases changed, rebuild the table on the next
+                # lookup instead of while the base is being modified.
+                self._lookupTable = None
+            return
+        # Keep our own lookup caches correct, but notify the dependent
+        # registries only once the bulk operation ends.
+        BaseAdapterRegistry.changed(self, originally_changed)
+        self._bulkChanged = True
+
+    def __reduce__(self):
+        # Referenced by the compact reference to the base registry
+        id = getReferenceId(self.__parent__)
+        if not id:
+            return super().__reduce__()
+        return BR, (id, self.__name__)
+
+    def freeze(self, flatten=False):
+        """Make the registry read-only and optimize it for lookups.
+
+        With ``flatten``, the lookups of the utilities are flattened into a
+        table, otherwise the lookup cache is warmed for the registered
+        adapters.
+        """
+        self.frozen = True
+        self._flatten = flatten
+        if flatten:
+            self._flattenLookups()
+        else:
+            self._warmCache()
+
+    def _getLookupTable(self):
+        if self._flatten and self._lookupTable is None:
+            self._flattenLookups()
+        return self._lookupTable
+
+    def _flattenLookups(self):
+        # Flatten the utility lookups along the bases chain.
+        provided = set()
+        for registry in self.ro:
+            for registration in registry.allRegistrations():
+                provided.update(registration[1].__iro__)
+        table = {}
+        for iface in provided:
+            table[iface] = {name: self.lookup((), iface, name)
+                            for name, value in self.lookupAll((), iface)}
+        self._lookupTable = table
+
+    def _warmCache(self):
+        # Warm the lookup cache for all registered adapters.
+        for registry in self.ro:
+            for required, iface, name, value in registry.allRegistrations():
+                if required:
+                    self.lookup(required, iface, name)
+
+
+# Serializes populating lazy registries; populating one may populate its
+# bases.
+_populateLock = threading.RLock()
+
+
 class BaseComponents(globalregistry.BaseGlobalComponents):
     """An ``IComponents`` implementation that serves as base for other
     components."""
 
+    # Adapter registries hidden until the deferred actions are executed
+    _lazyRegistries = None
+    # Deferred registration actions: ``[(callable, args, kw)]``
+    _deferred = ()
+    # Identifier of the thread executing the deferred actions
+    _populating = None
+
     def __init__(self, parent, *args, **kw):
         self.__parent__ = parent
         super().__init__(*args, **kw)
 
+    def _init_registries(self):
+        for name in ('_lazyRegistries', '_deferred', 'queryUtility',
+                     'getUtility', 'getUtilitiesFor'):
+            self.__dict__.pop(name, None)
+        self.adapters = BaseComponentsAdapterRegistry(self, 'adapters')
+        self.utilities = BaseComponentsAdapterRegistry(self, 'utilities')
+
+    def __getattr__(self, name):
+        # Only called for missing attributes, i.e. for the adapter
+        # registries while actions are deferred.
+        lazy = self.__dict__.get('_lazyRegistries')
+        if lazy is None or name not in lazy:
+            raise AttributeError(name)
+        if self._populating == threading.get_ident():
+            # The deferred actions register in the hidden registries.
+            return lazy[name]
+        self.populate()
+        return self.__dict__[name]
+
+    def defer(self, callable, *args, **kw):
+        """Defer a registration action until the registry is first used.
+
+        The registry is used when its adapter registries are accessed, for
+        example by a lookup or by adding the registry to the bases of another
+        registry.  If other registries already have it as base, their lookups
+        would never populate it, so the action is executed right away.
+        """
+        if self._lazyRegistries is None:
+            if self._hasDependents():
+                callable(*args, **kw)
+                return
+            self._lazyRegistries = {
+                'adapters': self.__dict__.pop('adapters'),
+                'utilities': self.__dict__.pop('utilities'),
+            }
+            self._deferred = []
+        self._deferred.append((callable, args, kw))
+
+    def _hasDependents(self):
+        return bool(self.adapters._v_subregistries
+                    or self.utilities._v_subregistries)
+
+    @property
+    def populated(self):
+        """Whether all deferred actions have been executed."""
+        return self._lazyRegistries is None
+
+    def populate(self):
+        """Execute all deferred actions.
+
+        Other threads only see the adapter registries once all actions are
+        executed.  If an action fails, the registry stays unpopulated and
+        executes all deferred actions again on the next access.
+        """
+        with _populateLock:
+            lazy = self._lazyRegistries
+            if lazy is None:
+                return
+            self._populating = threading.get_ident()
+            try:
+                with self.bulk():
+                    for callable, args, kw in self._deferred:
+                        callable(*args, **kw)
+            finally:
+                del self._populating
+            # Publish the registries before ``__getattr__`` stops finding
+            # them, other threads may access them in between.
+            self.__dict__.update(lazy)
+            del self._lazyRegistries, self._deferred
+
+    @property
+    def frozen(self):
+        return self.utilities.frozen
+
+    def freeze(self):
+        """Make the registry read-only and optimize it for lookups.
+
+        Utility lookups are served from a table flattened along the bases
+        chain and the adapter lookup cache is warmed.  The registry rejects
+        any further registrations and changes of its bases.
+        """
+        self.adapters.freeze()
+        self.utilities.freeze(flatten=True)
+        # Only frozen registries serve the utility lookups from the table,
+        # all others keep the lookups of ``Components``.
+        self.queryUtility = self._queryFrozenUtility
+        self.getUtility = self._getFrozenUtility
+        self.getUtilitiesFor = self._getFrozenUtilitiesFor
+
+    def _checkFrozen(self):
+        if self.frozen:
+            raise FrozenRegistryError(self)
+
+    def _setBases(self, bases):
+        self._checkFrozen()
+        super()._setBases(bases)
+
+    def registerUtility(self, *args, **kw):
+        self._checkFrozen()
+        super().registerUtility(*args, **kw)
+
+    def unregisterUtility(self, *args, **kw):
+        self._checkFrozen()
+        return super().unregisterUtility(*args, **kw)
+
+    def registerAdapter(self, *args, **kw):
+        self._checkFrozen()
+        super().registerAdapter(*args, **kw)
+
+    def unregisterAdapter(self, *args, **kw):
+        self._checkFrozen()
+        return super().unregisterAdapter(*args, **kw)
+
+    def registerSubscriptionAdapter(self, *args, **kw):
+        self._checkFrozen()
+        super().registerSubscriptionAdapter(*args, **kw)
+
+    def unregisterSubscriptionAdapter(self, *args, **kw):
+        self._checkFrozen()
+        return super().unregisterSubscriptionAdapter(*args, **kw)
+
+    def registerHandler(self, *args, **kw):
+        self._checkFrozen()
+        super().registerHandler(*args, **kw)
+
+    def unregisterHandler(self, *args, **kw):
+        self._checkFrozen()
+        return super().unregisterHandler(*args, **kw)
+
+    def _queryFrozenUtility(self, provided, name='', default=None):
+        table = self.utilities._lookupTable
+        if table is None:
+            table = self.utilities._getLookupTable()
+        return table.get(provided, _EMPTY).get(name, default)
+
+    def _getFrozenUtility(self, provided, name=''):
+        utility = self.queryUtility(provided, name)
+        if utility is None:
+            raise ComponentLookupError(provided, name)
+        return utility
+
+    def _getFrozenUtilitiesFor(self, interface):
+        table = self.utilities._lookupTable
+        if table is None:
+            table = self.utilities._getLookupTable()
+        return iter(table.get(interface, _EMPTY).items())
+
+    def beginBulk(self):
+        """Start deferring the notification of dependent registries."""
+        self.adapters.beginBulk()
+        self.utilities.beginBulk()
+
+    def endBulk(self):
+        """Notify dependent registries of all changes since ``beginBulk()``.
+        """
+        self.adapters.endBulk()
+        self.utilities.endBulk()
+
+    @contextlib.contextmanager
+    def bulk(self):
+        """Make many registrations, invalidating dependents only once."""
+        self.beginBulk()
+        try:
+            yield self
+        finally:
+            self.endBulk()
+
     def __reduce__(self):
-        # Global site managers are pickled as global objects
-        return BC, (self.__parent__, self.__name__)
+        # Registries below the global registry are pickled as a compact
+        # reference by name, all others by their parent and name.
+        id = getReferenceId(self)
+        if id is None:
+            return BC, (self.__parent__, self.__name__)
+        return BR, (id,)
+
+
+class DeltaComponents(BaseComponents):
+    """A base registry overriding a few registrations of a shared registry.
+
+    Utility and adapter lookups that none of its own registrations can
+    answer are delegated to the shared registry.  So they are served from
+    the lookup caches of the shared registry and the delta registry only
+    caches the lookups it overrides.
+    """
+
+    def __init__(self, parent, name, shared):
+        super().__init__(parent, name, (shared,))
+
+    def _init_registries(self):
+        super()._init_registries()
+        # ``{registry name: (generation, {provided: names})}``
+        self._provided = {}
+
+    @property
+    def shared(self):
+        return self.__bases__[0]
+
+    def _setBases(self, bases):
+        if len(bases) != 1:
+            raise ValueError('A delta registry has exactly one base.')
+        super()._setBases(bases)
+
+    def _overrides(self, registry, provided, name=None):
+        # Whether any of our registrations in the registry provides the
+        # interface, with the name unless it is ``None``.  The interfaces
+        # provided by our registrations and their names are collected once
+        # per generation of the registry, which also changes with the
+        # shared registry, so the decisions take as much memory as our few
+        # registrations and not as the lookups made.
+        cached = self._provided.get(registry.__name__)
+        if cached is None or cached[0] != registry._generation:
+            provides = {}
+            for required, registered, registeredName, value in (
+                    registry.allRegistrations()):
+                for iface in registered.__iro__:
+                    provides.setdefault(iface, set()).add(registeredName)
+            cached = self._provided[registry.__name__] = (
+                registry._generation, provides)
+        names = cached[1].get(provided)
+        return names is not None and (name is None or name in names)
+
+    def _getRegistry(self, kind, provided, name=None):
+        registry = getattr(self, kind)
+        if self._overrides(registry, provided, name):
+            return registry
+        return getattr(self.__bases__[0], kind)
+
+    def queryUtility(self, provided, name='', default=None):
+        if self._overrides(self.utilities, provided, name):
+            return self.utilities.lookup((), provided, name, default)
+        return self.__bases__[0].utilities.lookup((), provided, name, default)
+
+    def getUtility(self, provided, name=''):
+        utility = self.queryUtility(provided, name)
+        if utility is None:
+            raise ComponentLookupError(provided, name)
+        return utility
+
+    def getUtilitiesFor(self, interface):
+        if self._overrides(self.utilities, interface):
+            return super().getUtilitiesFor(interface)
+        return self.shared.getUtilitiesFor(interface)
+
+    def queryAdapter(self, object, interface, name='', default=None):
+        return self._getRegistry('adapters', interface, name).queryAdapter(
+            object, interface, name, default)
+
+    def getAdapter(self, object, interface, name=''):
+        adapter = self.queryAdapter(object, interface, name)
+        if adapter is None:
+            raise ComponentLookupError(object, interface, name)
+        return adapter
+
+    def queryMultiAdapter(self, objects, interface, name='', default=None):
+        return self._getRegistry(
+            'adapters', interface, name).queryMultiAdapter(
+                objects, interface, name, default)
+
+    def getMultiAdapter(self, objects, interface, name=''):
+        adapter = self.queryMultiAdapter(objects, interface, name)
+        if adapter is None:
+            raise ComponentLookupError(objects, interface, name)
+        return adapter
+
+    def getAdapters(self, objects, provided):
+        if self._overrides(self.adapters, provided):
+            return super().getAdapters(objects, provided)
+        return self.shared.getAdapters(objects, provided)
+
+
+try:
+    from zope.testing.cleanup import addCleanUp
+except ModuleNotFoundError:  # pragma: no cover
+    pass
+else:
+    addCleanUp(clearReferenceTable)
+    del addCleanUp
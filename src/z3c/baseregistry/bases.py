@@ -0,0 +1,163 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Setting the bases of many site managers at once.
+
+"""
+__docformat__ = "reStructuredText"
+import time
+
+from zope.interface.adapter import BaseAdapterRegistry
+from zope.site.interfaces import ILocalSiteManager
+from zope.site.site import LocalSiteManager
+
+from z3c.baseregistry import catalog
+from z3c.baseregistry.baseregistry import BaseComponents
+
+
+def replacingBase(registry, replacement):
+    """Return a function computing the bases of a site manager with the
+    registry replaced by the replacement registries, for ``setBases()``.
+
+    Registries which would appear twice are only kept at their first
+    position.
+    """
+    def getBases(sm):
+        bases = []
+        for base in sm.__bases__:
+            for new in (replacement if base is registry else (base,)):
+                if new not in bases:
+                    bases.append(new)
+        return bases
+    return getBases
+
+
+def _canShareBases(sm):
+    # ``_shareBases()`` replicates these ``_setBases()`` methods only.
+    return (type(sm)._setBases is LocalSiteManager._setBases
+            and type(sm.adapters)._setBases is BaseAdapterRegistry._setBases
+            and type(sm.utilities)._setBases is BaseAdapterRegistry._setBases)
+
+
+def _shareBases(sm, model):
+    # Give ``sm`` the bases of ``model`` like ``sm.__bases__ = bases``
+    # would, see ``LocalSiteManager._setBases()``, ``Components._setBases()``
+    # and ``BaseAdapterRegistry._setBases()``, but reuse the resolution
+    # orders of the registries of ``model`` instead of computing them again.
+    # They only depend on the bases.
+    bases = model.__bases__
+    old = sm.__bases__
+    for base in old:
+        if base not in bases and ILocalSiteManager.providedBy(base):
+            base.removeSub(sm)
+    for base in bases:
+        if base not in old and ILocalSiteManager.providedBy(base):
+            base.addSub(sm)
+    for registry, shared in ((sm.adapters, model.adapters),
+                             (sm.utilities, model.utilities)):
+        registry.__dict__['__bases__'] = shared.__bases__
+        registry.ro = [registry] + shared.ro[1:]
+        registry.changed(registry)
+    sm.__dict__['__bases__'] = bases
+    sm._p_changed = True
+
+
+def setBases(siteManagers, bases, batchSize=100, commit=None,
+             progress=None):
+    """Set the bases of many site managers.
+
+    ``bases`` is either a tuple of registries, used for all site managers,
+    or a callable returning the new bases for a site manager.  Site
+    managers which already have the new bases are skipped.  Site managers
+    getting equal bases share one bases tuple object, and the resolution
+    orders of their registries are computed once for all local site
+    managers of a group.
+
+    After every ``batchSize`` changed site managers ``commit`` is called,
+    e.g. ``transaction.commit``, and ``progress`` is called with the
+    statistics so far.  Return the statistics: the numbers of ``changed``
+    and ``unchanged`` site managers, of distinct bases tuples (``groups``),
+    and the elapsed ``seconds`` and site managers changed ``perSecond``.
+    """
+    getBases = bases if callable(bases) else (lambda sm: bases)
+    # The distinct new bases tuples
+    interned = {}
+    # The first site manager getting them, whose resolution orders are shared
+    models = {}
+    stats = {'changed': 0, 'unchanged': 0, 'groups': 0,
+             'seconds': 0.0, 'perSecond': 0.0}
+    start = time.perf_counter()
+
+    def update():
+        stats['groups'] = len(interned)
+        stats['seconds'] = seconds = time.perf_counter() - start
+        stats['perSecond'] = stats['changed'] / seconds if seconds else 0.0
+
+    pending = 0
+    for sm in siteManagers:
+        new = tuple(getBases(sm))
+        if new == tuple(sm.__bases__):
+            stats['unchanged'] += 1
+            continue
+        new = interned.setdefault(new, new)
+        model = models.get(new)
+        if not _canShareBases(sm):
+            sm.__bases__ = new
+        elif model is None:
+            sm.__bases__ = new
+            models[new] = sm
+        else:
+            _shareBases(sm, model)
+        # The orders including the site manager are outdated now
+        for other in [other for other in models.values()
+                      if sm.utilities in other.utilities.ro[1:]]:
+            del models[other.__bases__]
+        catalog.indexSiteManager(sm)
+        stats['changed'] += 1
+        pending += 1
+        if pending == batchSize:
+            pending = 0
+            if commit is not None:
+                commit()
+            if progress is not None:
+                update()
+                progress(dict(stats))
+
+    if pending and commit is not None:
+        commit()
+    update()
+    return stats
+
+
+def migrateReferences(siteManagers, batchSize=100, commit=None):
+    """Store the base registries of site managers as compact references.
+
+    Site managers saved by earlier versions reference their base registries
+    by parent and name.  These pickles still load, but keep the longer
+    references until they are saved again.  Mark the site managers having
+    base registries, and their adapter registries, as changed, and call
+    ``commit`` after every ``batchSize`` of them.  Return the number of
+    migrated site managers.
+    """
+    migrated = 0
+    for sm in siteManagers:
+        if not any(isinstance(base, BaseComponents) for base in sm.__bases__):
+            continue
+        for changed in (sm, sm.adapters, sm.utilities):
+            changed._p_changed = True
+        migrated += 1
+        if commit is not None and not migrated % batchSize:
+            commit()
+    if commit is not None and migrated % batchSize:
+        commit()
+    return migrated
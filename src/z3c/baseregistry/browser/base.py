@@ -16,17 +16,23 @@
 """
 
 __docformat__ = "reStructuredText"
+import weakref
+
+import transaction
 import zope.interface
 from zope import component
 from zope.component import globalregistry
 from zope.formlib import form
 from zope.i18nmessageid import ZopeMessageFactory as _
-from zope.interface.interfaces import IComponents
+from zope.location import inside
 from zope.schema.vocabulary import SimpleTerm
 from zope.schema.vocabulary import SimpleVocabulary
 from zope.security.proxy import removeSecurityProxy
 from zope.site.interfaces import ILocalSiteManager
 
+from z3c.baseregistry import bases
+from z3c.baseregistry import catalog
+
 
 BASENAME = _('-- Global Base Registry --')
 PARENTNAME = _('-- Parent Local Registry --')
@@ -41,7 +47,8 @@ class BaseComponentsVocabulary(SimpleVocabulary):
         utils = set()
 
         # add available registry utilities
-        for name, util in component.getUtilitiesFor(IComponents, context):
+        sm = removeSecurityProxy(component.getSiteManager(context))
+        for name, util in catalog.getRegistries(sm):
             terms.append(SimpleTerm(util, name))
             utils.add(util)
 
@@ -58,6 +65,28 @@ class BaseComponentsVocabulary(SimpleVocabulary):
         super().__init__(terms)
 
 
+# Vocabularies by site manager: ``{sm: (registries, vocabulary)}``
+_vocabularies = weakref.WeakKeyDictionary()
+
+
+@zope.interface.provider(zope.schema.interfaces.IVocabularyFactory)
+def baseComponentsVocabulary(context):
+    """Return the "Base Components" vocabulary, reusing it while the
+    available registries and the bases do not change."""
+    sm = removeSecurityProxy(component.getSiteManager(context))
+    registries = catalog.getRegistries(sm)
+    cached = _vocabularies.get(sm)
+    if cached is None or cached[0] is not registries:
+        cached = _vocabularies[sm] = (
+            registries, BaseComponentsVocabulary(context))
+    return cached[1]
+
+
+def basesModified(sm, event):
+    """Index the new bases of a site manager changed in the "Bases" form."""
+    catalog.indexSiteManager(removeSecurityProxy(sm))
+
+
 class IComponentsBases(zope.interface.Interface):
     """An interface describing the bases API of the IComponents object."""
 
@@ -71,3 +100,63 @@ class IComponentsBases(zope.interface.Interface):
 class SetBasesPage(form.EditForm):
     """A page to set the bases of a local site manager"""
     form_fields = form.FormFields(IComponentsBases)
+
+
+class IBulkBases(zope.interface.Interface):
+    """Replacing a base of all site managers using it."""
+
+    registry = zope.schema.Choice(
+        title=_('Registry'),
+        description=_('The base registry to replace in all site managers'
+                      ' using it.'),
+        vocabulary='Base Components',
+        required=True)
+
+    replacement = zope.schema.List(
+        title=_('Replacement'),
+        description=_('The base registries to use instead.'),
+        value_type=zope.schema.Choice(vocabulary='Base Components'),
+        required=True)
+
+    batchSize = zope.schema.Int(
+        title=_('Batch size'),
+        description=_('The number of site managers changed per transaction.'),
+        min=1,
+        default=100,
+        required=True)
+
+
+class BulkBasesPage(form.Form):
+    """A page to replace a base of many local site managers."""
+    form_fields = form.FormFields(IBulkBases)
+
+    def getDependents(self, registry):
+        """Return the site managers using the registry in the site of the
+        context and in all sites below it.
+
+        They are taken from the registry index, the sites are only searched
+        if there is none.
+        """
+        site = removeSecurityProxy(self.context).__parent__
+        if catalog.getIndex(site) is None:
+            return [sm for sm in catalog.findSiteManagers(site)
+                    if registry in sm.__bases__]
+        return [sm for sm in catalog.getDependents(registry, site)
+                if inside(sm, site)]
+
+    @form.action(_('Apply'))
+    def handle_apply(self, action, data):
+        siteManagers = self.getDependents(data['registry'])
+        stats = bases.setBases(
+            siteManagers,
+            bases.replacingBase(data['registry'], data['replacement']),
+            data['batchSize'], commit=transaction.commit)
+        self.status = _(
+            'Changed ${changed} site managers (${unchanged} unchanged) in'
+            ' ${seconds} seconds, ${perSecond} per second.',
+            mapping={
+                'changed': stats['changed'],
+                'unchanged': stats['unchanged'],
+                'seconds': '%.2f' % stats['seconds'],
+                'perSecond': '%.1f' % stats['perSecond'],
+            })
@@ -57,7 +57,7 @@ example3 = Example('example3')
 example4 = Example('example4')
 
 
-def addBasesSelection(browser, bases):
+def addBasesSelection(browser, bases, name='form.__bases__'):
     # Get the form
     from webtest.forms import MultipleSelect
     from zope.testbrowser.browser import ListControl
@@ -67,9 +67,9 @@ def addBasesSelection(browser, bases):
 
     # Create the select tag
     webtest_select = MultipleSelect(webtest_form, None,
-                                    name="form.__bases__",
+                                    name=name,
                                     pos=0,
-                                    id="form.__bases__")
+                                    id=name)
     # Add the options.
     # Be careful to keep the option indexes in the order that matches
     # the test.
@@ -79,8 +79,8 @@ def addBasesSelection(browser, bases):
     webtest_select.select_multiple(texts=bases)
 
     # Add the select tag to the form
-    webtest_form.fields['form.__bases__'] = [webtest_select]
-    webtest_form.field_order.append(('form.__bases__', webtest_select))
+    webtest_form.fields[name] = [webtest_select]
+    webtest_form.field_order.append((name, webtest_select))
     # And the browser
     select = ListControl(webtest_select, form, 'select', browser)
     form.controls.append(select)
@@ -0,0 +1,207 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""An index of the available registries and of the site managers using them.
+
+"""
+__docformat__ = "reStructuredText"
+import weakref
+
+import persistent
+import zope.interface
+from persistent.mapping import PersistentMapping
+from zope.component.interfaces import ISite
+from zope.container.contained import Contained
+from zope.container.interfaces import IReadContainer
+from zope.interface.interfaces import ComponentLookupError
+from zope.interface.interfaces import IComponents
+
+from z3c.baseregistry.baseregistry import getReferenceId
+
+
+# Available registries: ``{components: (generations, registries)}``
+_registries = weakref.WeakKeyDictionary()
+
+
+def getRegistries(components):
+    """Return the named ``IComponents`` utilities available in a registry.
+
+    The result is a tuple of ``(name, registry)`` pairs.  It is computed
+    once and served from the index until a utility is (un)registered in the
+    registry or any of its bases, or until the bases change.
+    """
+    generations = tuple(r._generation for r in components.utilities.ro)
+    cached = _registries.get(components)
+    if cached is not None and cached[0] == generations:
+        return cached[1]
+    registries = tuple(components.getUtilitiesFor(IComponents))
+    _registries[components] = generations, registries
+    return registries
+
+
+class IRegistryIndex(zope.interface.Interface):
+    """A persistent index of the site managers using a registry as base."""
+
+    def index(sm):
+        """Update the index with the current bases of a site manager."""
+
+    def unindex(sm):
+        """Remove a site manager from the index."""
+
+    def getDependents(registry):
+        """Return the indexed site managers having the registry as base."""
+
+
+def _getKey(registry):
+    # Global registries are stored by their compact reference, local ones,
+    # e.g. the site manager of a parent site, by themselves.
+    id = getReferenceId(registry)
+    return registry if id is None else id
+
+
+@zope.interface.implementer(IRegistryIndex)
+class RegistryIndex(persistent.Persistent, Contained):
+    """A persistent ``IRegistryIndex`` of the sites below the site it is
+    registered in.
+
+    See ``installIndex()``.
+    """
+
+    def __init__(self):
+        # ``{key: {site manager: None}}``, see ``_getKey()``
+        self._dependents = PersistentMapping()
+
+    def index(self, sm):
+        keys = {_getKey(base) for base in sm.__bases__}
+        for key, siteManagers in self._dependents.items():
+            if key not in keys and sm in siteManagers:
+                del siteManagers[sm]
+        for key in keys:
+            siteManagers = self._dependents.get(key)
+            if siteManagers is None:
+                siteManagers = self._dependents[key] = PersistentMapping()
+            if sm not in siteManagers:
+                siteManagers[sm] = None
+
+    def unindex(self, sm):
+        for siteManagers in self._dependents.values():
+            if sm in siteManagers:
+                del siteManagers[sm]
+
+    def getDependents(self, registry):
+        return [sm for sm in self._dependents.get(_getKey(registry), ())
+                if registry in sm.__bases__]
+
+
+def getIndex(context):
+    """Return the registry index of the nearest site of the context having
+    one, or ``None``."""
+    while context is not None:
+        if ISite.providedBy(context):
+            index = context.getSiteManager().queryUtility(IRegistryIndex)
+            if index is not None:
+                return index
+        context = getattr(context, '__parent__', None)
+    return None
+
+
+def installIndex(site, name='registryIndex'):
+    """Add a ``RegistryIndex`` to the site manager of a site, register it
+    and index all site managers in and below the site.
+
+    Return the index.
+    """
+    sm = site.getSiteManager()
+    index = sm['default'][name] = RegistryIndex()
+    sm.registerUtility(index, IRegistryIndex)
+    indexSites(site)
+    return index
+
+
+def indexSiteManager(sm):
+    """Update the registry index with the current bases of a site manager.
+
+    This happens automatically for new local sites and for changes made in
+    the "Bases" form.  Call it after setting ``__bases__`` in code.  Site
+    managers without a registry index in any site above them are ignored.
+    """
+    index = getIndex(sm)
+    if index is not None:
+        index.index(sm)
+
+
+def getDependents(registry, context):
+    """Return the site managers having the registry as base, from the
+    registry index of the context, see ``getIndex()``.
+
+    Raise ``ComponentLookupError`` if there is no registry index.
+    """
+    index = getIndex(context)
+    if index is None:
+        raise ComponentLookupError(IRegistryIndex)
+    return index.getDependents(registry)
+
+
+def findSiteManagers(root):
+    """Return the site managers of all sites in a content tree.
+
+    The tree is traversed from ``root``, which is included, through all
+    containers.
+    """
+    found = []
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if ISite.providedBy(obj):
+            found.append(obj.getSiteManager())
+        if IReadContainer.providedBy(obj):
+            stack.extend(reversed(list(obj.values())))
+    return found
+
+
+def indexSites(root):
+    """Index the site managers of all sites in a content tree, e.g. after
+    installing the registry index in an existing site.
+
+    Return the site managers, see ``findSiteManagers()``.
+    """
+    siteManagers = findSiteManagers(root)
+    for sm in siteManagers:
+        indexSiteManager(sm)
+    return siteManagers
+
+
+def newLocalSite(event):
+    """Index the site manager of a new local site."""
+    indexSiteManager(event.manager)
+
+
+def siteRemoved(site, event):
+    """Remove the site manager of a removed site from the registry index."""
+    index = getIndex(event.oldParent)
+    if index is not None:
+        index.unindex(site.getSiteManager())
+
+
+def clearCatalog():
+    """Clear the cache of ``getRegistries()``."""
+    _registries.clear()
+
+
+try:
+    from zope.testing.cleanup import addCleanUp
+except ModuleNotFoundError:  # pragma: no cover
+    pass
+else:
+    addCleanUp(clearCatalog)
+    del addCleanUp
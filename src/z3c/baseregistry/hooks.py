@@ -0,0 +1,95 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Selecting the active registry per execution context.
+
+The site of ``zope.component.hooks`` is thread-local, so all asyncio tasks
+of a thread share it.  The registry selected by ``useRegistry()`` is stored
+in a context variable instead: each task has its own.  The hooks installed
+by ``setHooks()`` make ``zope.component`` use the selected registry, and the
+current site when no registry is selected.
+
+"""
+__docformat__ = "reStructuredText"
+import contextlib
+import contextvars
+
+import zope.component
+import zope.component.hooks
+
+
+_activeRegistry = contextvars.ContextVar(
+    'z3c.baseregistry.activeRegistry', default=None)
+
+
+def getActiveRegistry():
+    """Return the registry selected in the current context, if any."""
+    return _activeRegistry.get()
+
+
+def activateRegistry(registry):
+    """Select the registry in the current context.
+
+    Return a token to pass to ``deactivateRegistry()``.
+    """
+    return _activeRegistry.set(registry)
+
+
+def deactivateRegistry(token):
+    """Restore the registry selected before ``activateRegistry()``."""
+    _activeRegistry.reset(token)
+
+
+@contextlib.contextmanager
+def useRegistry(registry):
+    """Select the registry for the duration of the ``with`` body."""
+    token = _activeRegistry.set(registry)
+    try:
+        yield registry
+    finally:
+        _activeRegistry.reset(token)
+
+
+def getSiteManager(context=None):
+    """Return the selected registry, or the site manager of the site."""
+    if context is None:
+        registry = _activeRegistry.get()
+        if registry is not None:
+            return registry
+    return zope.component.hooks.getSiteManager(context)
+
+
+def adapter_hook(interface, object, name='', default=None):
+    registry = _activeRegistry.get()
+    if registry is None:
+        return zope.component.hooks.adapter_hook(
+            interface, object, name, default)
+    return registry.adapters.adapter_hook(interface, object, name, default)
+
+
+def setHooks():
+    """Make ``zope.component`` respect the selected registry and the site.
+
+    This replaces ``zope.component.hooks.setHooks()``.
+    """
+    from zope.component import _api
+    _api.getSiteManager.sethook(getSiteManager)
+    _api.adapter_hook.sethook(adapter_hook)
+
+
+def hooksInstalled():
+    """Return whether the hooks of ``setHooks()`` are in effect."""
+    return zope.component.getSiteManager.implementation is getSiteManager
+
+
+resetHooks = zope.component.hooks.resetHooks
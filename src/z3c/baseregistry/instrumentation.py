@@ -0,0 +1,190 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Opt-in lookup instrumentation for components registries.
+
+Instrumenting a registry replaces the lookup methods of its adapter
+registries by wrappers reporting each lookup to a listener.  Registries that
+are not instrumented are not affected at all.
+
+"""
+__docformat__ = "reStructuredText"
+import json
+import time
+
+from zope.interface.adapter import _lookup
+from zope.interface.declarations import providedBy
+
+
+def getRegistryName(registry):
+    """Return a name for an adapter registry or its components registry."""
+    components = getattr(registry, '__parent__', registry)
+    return getattr(components, '__name__', None) or repr(components)
+
+
+def getServingRegistry(registry, required, provided, name=''):
+    """Find the registry in the resolution order that answers a lookup.
+
+    Return the number of registries consulted and the serving registry,
+    which is ``None`` if the lookup fails.
+    """
+    # This follows ``AdapterLookupBase._uncached_lookup()``.
+    order = len(required)
+    for depth, base in enumerate(registry.ro, 1):
+        byorder = base._adapters
+        if order >= len(byorder):
+            continue
+        extendors = base._v_lookup._extendors.get(provided)
+        if not extendors:
+            continue
+        if _lookup(byorder[order], required, extendors, name, 0,
+                   order) is not None:
+            return depth, base
+    return len(registry.ro), None
+
+
+class LookupStats:
+    """Lookup statistics aggregated by kind, interface and name."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._entries = {}
+
+    def record(self, kind, registry, required, provided, name, elapsed):
+        depth, served = getServingRegistry(registry, required, provided, name)
+        key = (kind, provided.__identifier__, name)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = {
+                'kind': kind,
+                'interface': provided.__identifier__,
+                'name': name,
+                'lookups': 0,
+                'hits': 0,
+                'misses': 0,
+                'depth': 0,
+                'time': 0.0,
+                'maxTime': 0.0,
+                'servedBy': {},
+            }
+        entry['lookups'] += 1
+        entry['depth'] += depth
+        entry['time'] += elapsed
+        entry['maxTime'] = max(entry['maxTime'], elapsed)
+        if served is None:
+            entry['misses'] += 1
+        else:
+            entry['hits'] += 1
+            label = getRegistryName(served)
+            entry['servedBy'][label] = entry['servedBy'].get(label, 0) + 1
+
+    def asList(self):
+        """Return the statistics as a list of plain dicts.
+
+        ``depth`` and ``time`` are totals over all lookups.
+        """
+        return [dict(entry, servedBy=dict(entry['servedBy']))
+                for key, entry in sorted(self._entries.items())]
+
+    def toJSON(self, **kw):
+        return json.dumps(self.asList(), **kw)
+
+
+def _instrumentUtilities(registry, listener):
+    lookup = registry._v_lookup.lookup
+
+    def instrumentedLookup(required, provided, name='', default=None):
+        start = time.perf_counter()
+        result = lookup(required, provided, name, default)
+        elapsed = time.perf_counter() - start
+        listener.record('utility', registry, tuple(required), provided, name,
+                        elapsed)
+        return result
+
+    return {'lookup': instrumentedLookup}
+
+
+def _instrumentAdapters(registry, listener):
+    lookup = registry._v_lookup.lookup
+    queryAdapter = registry._v_lookup.queryAdapter
+    adapter_hook = registry._v_lookup.adapter_hook
+    queryMultiAdapter = registry._v_lookup.queryMultiAdapter
+
+    def instrumentedLookup(required, provided, name='', default=None):
+        start = time.perf_counter()
+        result = lookup(required, provided, name, default)
+        elapsed = time.perf_counter() - start
+        listener.record('adapter', registry, tuple(required), provided, name,
+                        elapsed)
+        return result
+
+    def instrumentedQueryAdapter(object, provided, name='', default=None):
+        start = time.perf_counter()
+        result = queryAdapter(object, provided, name, default)
+        elapsed = time.perf_counter() - start
+        listener.record('adapter', registry, (providedBy(object),), provided,
+                        name, elapsed)
+        return result
+
+    def instrumentedAdapterHook(provided, object, name='', default=None):
+        start = time.perf_counter()
+        result = adapter_hook(provided, object, name, default)
+        elapsed = time.perf_counter() - start
+        listener.record('adapter', registry, (providedBy(object),), provided,
+                        name, elapsed)
+        return result
+
+    def instrumentedQueryMultiAdapter(objects, provided, name='',
+                                      default=None):
+        start = time.perf_counter()
+        result = queryMultiAdapter(objects, provided, name, default)
+        elapsed = time.perf_counter() - start
+        listener.record('adapter', registry,
+                        tuple(providedBy(o) for o in objects), provided,
+                        name, elapsed)
+        return result
+
+    return {
+        'lookup': instrumentedLookup,
+        'queryAdapter': instrumentedQueryAdapter,
+        'adapter_hook': instrumentedAdapterHook,
+        'queryMultiAdapter': instrumentedQueryMultiAdapter,
+    }
+
+
+def instrument(components, listener):
+    """Report all lookups of a components registry to the listener.
+
+    The listener's ``record(kind, registry, required, provided, name,
+    elapsed)`` method is called after each utility or adapter lookup, for
+    example on a ``LookupStats`` object.  Utility lookups of frozen
+    registries bypass the adapter registry and are not reported.
+    """
+    uninstrument(components)
+    for registry, wrappers in (
+            (components.utilities,
+             _instrumentUtilities(components.utilities, listener)),
+            (components.adapters,
+             _instrumentAdapters(components.adapters, listener))):
+        # Like ``_createLookup()``, bypass persistence machinery so that
+        # instrumenting a persistent registry does not change it.
+        registry.__dict__.update(wrappers)
+
+
+def uninstrument(components):
+    """Remove the instrumentation from a components registry."""
+    for registry in (components.utilities, components.adapters):
+        for name in registry._delegated:
+            registry.__dict__[name] = getattr(registry._v_lookup, name)
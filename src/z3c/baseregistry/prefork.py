@@ -0,0 +1,100 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Preparing base registries for forking servers.
+
+Call ``preload()`` in the master process before forking the workers, e.g.
+from a server's startup hook::
+
+  from z3c.baseregistry import prefork
+  prefork.preload('site.zcml')
+
+The workers then share the populated registries with the master, as long as
+they do not modify them.
+
+"""
+__docformat__ = "reStructuredText"
+import gc
+
+from zope.configuration import xmlconfig
+
+from z3c.baseregistry.baseregistry import BaseComponents
+from z3c.baseregistry.baseregistry import buildReferenceTable
+from z3c.baseregistry.snapshot import getRegistries
+from z3c.baseregistry.warmup import replay
+from z3c.baseregistry.zcml import ConfigurationMachine
+
+
+def warm(components):
+    """Fill the lookup caches of a registry for all its registrations."""
+    for registry in (components.adapters, components.utilities):
+        for required, provided, name, value in registry.allRegistrations():
+            registry.lookup(required, provided, name)
+
+
+def preload(filename='site.zcml', package=None, registries=None,
+            freeze=True, lookups=None, profile=None):
+    """Execute the configuration and prepare the registries for forking.
+
+    All base registries -- by default the ones registered in the global
+    registry -- are populated, also if they are lazy.  With ``freeze``, base
+    registries are frozen, which flattens their utility lookups into a table.
+    The lookup caches of all other registries are filled and the references
+    to base registries in pickles are resolved in advance.  ``lookups`` is
+    an optional file of lookups recorded by ``warmup.LookupRecorder`` to
+    replay.  A ``profiling.ConfigurationProfile`` profiles the execution of
+    the configuration.
+
+    Finally all objects are moved out of garbage collection, so that
+    collections in the workers do not write to the shared memory pages.
+    Return the configuration context.
+    """
+    context = ConfigurationMachine(profile=profile)
+    context.package = package
+    xmlconfig.registerCommonDirectives(context)
+    xmlconfig.file(filename, package, context)
+    if registries is None:
+        registries = getRegistries()
+    for registry in registries:
+        if isinstance(registry, BaseComponents):
+            registry.populate()
+            if freeze:
+                registry.freeze()
+                continue
+        warm(registry)
+    buildReferenceTable()
+    if lookups is not None:
+        replay(lookups)
+    gc.collect()
+    gc.freeze()
+    return context
+
+
+def memoryUsage(pid='self'):
+    """Return the shared and private memory of a process in bytes.
+
+    The values are read from ``/proc/<pid>/smaps_rollup``, which is only
+    available on Linux.
+    """
+    usage = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if value.strip().endswith(' kB'):
+                usage[name] = int(value.split()[0]) * 1024
+    return {
+        'rss': usage['Rss'],
+        'pss': usage['Pss'],
+        'shared': usage['Shared_Clean'] + usage['Shared_Dirty'],
+        'private': usage['Private_Clean'] + usage['Private_Dirty'],
+    }
@@ -0,0 +1,166 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Opt-in profiling of ``registerIn`` configuration.
+
+A profile is only collected when it is passed to
+``z3c.baseregistry.zcml.ConfigurationMachine``.  Otherwise the ``registerIn``
+directive and the configuration machine do not record anything.
+
+"""
+__docformat__ = "reStructuredText"
+import json
+import time
+
+
+def _getName(registry):
+    return getattr(registry, '__name__', None) or repr(registry)
+
+
+def _addTime(entry, kind, seconds):
+    byType = entry['byType'].setdefault(kind, {'actions': 0, 'time': 0.0})
+    byType['time'] += seconds
+    entry['executeTime'] += seconds
+
+
+class ConfigurationProfile:
+    """Timings of the ``registerIn`` blocks and of the registries they fill.
+
+    For every block and every target registry the profile records the
+    number of actions, the time to parse the block, the time to resolve the
+    conflicts among the actions of the registry and the execution time by
+    action type.  When the configuration machine has executed all actions it
+    calls ``emit``, if given, with the report.
+    """
+
+    def __init__(self, emit=None):
+        self.emit = emit
+        self.clear()
+
+    def clear(self):
+        self._blocks = []
+        # ``{id(block): start of parsing}``
+        self._starts = {}
+        # ``{registry: entry}``
+        self._registries = {}
+        # ``{id(action): (action, block, registry entry, kind)}``
+        self._actions = {}
+        self.resolveTime = 0.0
+        self.executeTime = 0.0
+
+    def _getRegistry(self, registry):
+        entry = self._registries.get(registry)
+        if entry is None:
+            entry = self._registries[registry] = {
+                'registry': _getName(registry),
+                'blocks': 0,
+                'actions': 0,
+                'parseTime': 0.0,
+                'resolveTime': 0.0,
+                'executeTime': 0.0,
+                'byType': {},
+            }
+        return entry
+
+    def beginBlock(self, registries, lazy=False):
+        """Start parsing a ``registerIn`` block and return its entry."""
+        block = {
+            'file': None,
+            'line': None,
+            'registries': [_getName(registry) for registry in registries],
+            'lazy': lazy,
+            'actions': 0,
+            'parseTime': 0.0,
+            'executeTime': 0.0,
+            'byType': {},
+        }
+        self._blocks.append(block)
+        self._starts[id(block)] = time.perf_counter()
+        for registry in registries:
+            self._getRegistry(registry)['blocks'] += 1
+        return block
+
+    def endBlock(self, block, registries, info=None):
+        """Finish parsing a ``registerIn`` block."""
+        block['parseTime'] = (
+            time.perf_counter() - self._starts.pop(id(block)))
+        block['file'] = getattr(info, 'file', None)
+        block['line'] = getattr(info, 'line', None)
+        for registry in registries:
+            self._getRegistry(registry)['parseTime'] += block['parseTime']
+
+    def addAction(self, block, registry, action, kind):
+        """Record an action of a block, decorated for one registry."""
+        entry = self._getRegistry(registry)
+        self._actions[id(action)] = action, block, entry, kind
+        for counted in (block, entry):
+            counted['actions'] += 1
+            byType = counted['byType'].setdefault(
+                kind, {'actions': 0, 'time': 0.0})
+            byType['actions'] += 1
+
+    def recordResolution(self, registry, seconds):
+        """Record the time to resolve the conflicts of a registry."""
+        if registry is not None:
+            self._getRegistry(registry)['resolveTime'] += seconds
+
+    def timed(self, action):
+        """Return the callable of an action, recording its execution time.
+        """
+        callable = action['callable']
+        recorded = self._actions.get(id(action))
+
+        def timedCallable(*args, **kw):
+            start = time.perf_counter()
+            try:
+                return callable(*args, **kw)
+            finally:
+                seconds = time.perf_counter() - start
+                self.executeTime += seconds
+                if recorded is not None:
+                    _, block, entry, kind = recorded
+                    _addTime(block, kind, seconds)
+                    _addTime(entry, kind, seconds)
+
+        return timedCallable
+
+    def finish(self):
+        """Emit the report once all actions are executed and return it."""
+        self._actions.clear()
+        report = self.getReport()
+        if self.emit is not None:
+            self.emit(report)
+        return report
+
+    def getReport(self):
+        """Return the profile as plain dicts and lists.
+
+        All times are in seconds.  ``resolveTime`` and ``executeTime`` at
+        the top level include the actions outside of ``registerIn`` blocks.
+        """
+        def copy(entry):
+            return dict(entry, byType={
+                kind: dict(byType)
+                for kind, byType in sorted(entry['byType'].items())})
+
+        return {
+            'blocks': [dict(copy(block), registries=list(block['registries']))
+                       for block in self._blocks],
+            'registries': [copy(entry)
+                           for entry in self._registries.values()],
+            'resolveTime': self.resolveTime,
+            'executeTime': self.executeTime,
+        }
+
+    def toJSON(self, **kw):
+        return json.dumps(self.getReport(), **kw)
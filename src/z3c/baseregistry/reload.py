@@ -0,0 +1,100 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Reloading the ``registerIn`` registrations of a single registry.
+
+"""
+__docformat__ = "reStructuredText"
+from zope.configuration import xmlconfig
+from zope.interface.registry import Components
+
+from z3c.baseregistry.baseregistry import BaseComponents
+from z3c.baseregistry.baseregistry import FrozenRegistryError
+from z3c.baseregistry.snapshot import applyState
+from z3c.baseregistry.snapshot import copyState
+from z3c.baseregistry.zcml import callInRegistry
+from z3c.baseregistry.zcml import provideInterface
+from z3c.baseregistry.zcml import registryHandler
+
+
+_BOUND_CALLABLES = (registryHandler, provideInterface, callInRegistry)
+
+
+def _rebind(action, registry, target):
+    # Return the action bound to ``target`` instead, if ``registerIn`` bound
+    # it to ``registry``.
+    callable = action['callable']
+    args = tuple(action['args'])
+    if (getattr(callable, '__func__', None) is BaseComponents.defer
+            and callable.__self__ is registry):
+        callable, args = args[0], args[1:]
+    if callable not in _BOUND_CALLABLES or args[:1] != (registry,):
+        return None
+    return dict(action, callable=callable, args=(target,) + args[1:])
+
+
+def _reuseUtilities(current, new):
+    for key, (component, info, factory) in new.items():
+        old = current.get(key)
+        if old is not None and old[0] is component and old[2] is factory:
+            new[key] = old
+
+
+def _reuseAdapters(current, new):
+    for key, (factory, info) in new.items():
+        old = current.get(key)
+        if old is not None and old[0] is factory:
+            new[key] = old
+
+
+def _reuseSubscriptions(current, new):
+    # All but the last item, the info, identify a subscription.
+    old = {}
+    for entry in current:
+        old.setdefault(entry[:-1], []).append(entry)
+    for i, entry in enumerate(new):
+        same = old.get(entry[:-1])
+        if same:
+            new[i] = same.pop(0)
+
+
+def reloadRegistry(registry, filename='configure.zcml', package=None):
+    """Execute the ``registerIn`` actions for a registry again.
+
+    The ZCML file is processed anew, but only the actions that
+    ``registerIn`` blocks bound to the registry are executed, into a
+    temporary registry.  Then the registrations of the registry which are
+    no longer configured are removed and the new ones are added in a single
+    batch.  Unchanged registrations, and all other registries, are not
+    touched.  A lazy registry which is not populated yet stays lazy.
+    """
+    populated = getattr(registry, 'populated', True)
+    if populated and getattr(registry, 'frozen', False):
+        raise FrozenRegistryError(registry)
+    context = xmlconfig.file(filename, package, execute=False)
+    scratch = Components(registry.__name__, registry.__bases__)
+    actions = [_rebind(action, registry, scratch)
+               for action in context.actions if action['callable']]
+    context.actions = [action for action in actions if action is not None]
+    context.execute_actions()
+
+    state = copyState(scratch)
+    if not populated:
+        registry._deferred[:] = [(applyState, (registry, state), {})]
+        return
+    _reuseUtilities(registry._utility_registrations, state['utilities'])
+    _reuseAdapters(registry._adapter_registrations, state['adapters'])
+    _reuseSubscriptions(
+        registry._subscription_registrations, state['subscribers'])
+    _reuseSubscriptions(registry._handler_registrations, state['handlers'])
+    applyState(registry, state)
@@ -0,0 +1,130 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Registrations and memory report of base registries.
+
+"""
+__docformat__ = "reStructuredText"
+import argparse
+import json
+import sys
+
+from zope.configuration import xmlconfig
+
+from z3c.baseregistry.instrumentation import getRegistryName
+from z3c.baseregistry.snapshot import getRegistries
+
+
+_CONTAINERS = (dict, list, tuple, set, frozenset)
+
+
+def getSize(obj):
+    """Approximate the memory used by nested containers, in bytes.
+
+    Only containers and strings are counted: the registered components and
+    the interfaces are shared with other objects.
+    """
+    size = 0
+    seen = set()
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, str):
+            size += sys.getsizeof(obj)
+        elif isinstance(obj, _CONTAINERS):
+            size += sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            else:
+                stack.extend(obj)
+    return size
+
+
+def getCacheInfo(registry):
+    """Return the numbers of entries of an adapter registry's lookup caches.
+
+    The cached results themselves are not accessible; ``required`` is the
+    number of required specifications looked up and ``extendors`` the number
+    of provided interfaces.  For frozen registries ``table`` is the number
+    of entries of the flattened lookup table.
+    """
+    lookup = registry._v_lookup
+    info = {
+        'required': len(lookup._required),
+        'extendors': len(lookup._extendors),
+    }
+    table = getattr(registry, '_lookupTable', None)
+    if table is not None:
+        info['table'] = sum(len(names) for names in table.values())
+    return info
+
+
+def getRegistryReport(components):
+    """Return the report of a components registry as a dict.
+
+    Registries which are still to be populated lazily are not populated.
+    """
+    report = {
+        'name': components.__name__,
+        'utilities': len(components._utility_registrations),
+        'adapters': len(components._adapter_registrations),
+        'subscribers': len(components._subscription_registrations),
+        'handlers': len(components._handler_registrations),
+        'populated': getattr(components, 'populated', True),
+    }
+    if not report['populated']:
+        return report
+    report['bases'] = [getRegistryName(base) for base in components.__bases__]
+    report['caches'] = {
+        'adapters': getCacheInfo(components.adapters),
+        'utilities': getCacheInfo(components.utilities),
+    }
+    report['size'] = sum(getSize(data) for data in (
+        components._utility_registrations,
+        components._adapter_registrations,
+        components._subscription_registrations,
+        components._handler_registrations,
+        components.adapters._adapters,
+        components.adapters._subscribers,
+        components.adapters._provided,
+        components.utilities._adapters,
+        components.utilities._subscribers,
+        components.utilities._provided,
+    ))
+    return report
+
+
+def getReport(parent=None):
+    """Return the reports of a registry and the base registries in it."""
+    return [getRegistryReport(registry)
+            for registry in getRegistries(parent)]
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Report the registrations and memory of base registries.')
+    parser.add_argument('zcml', help='The ZCML file to execute first.')
+    parser.add_argument('--output', help='Write the report to this file.')
+    options = parser.parse_args(args)
+
+    xmlconfig.file(options.zcml)
+    output = json.dumps(getReport(), indent=2)
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
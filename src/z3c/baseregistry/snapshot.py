@@ -0,0 +1,294 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""On-disk snapshots of populated base registries.
+
+"""
+__docformat__ = "reStructuredText"
+import contextlib
+import hashlib
+import pickle
+import sys
+
+from zope.component import globalregistry
+from zope.interface.interfaces import IComponents
+
+from z3c.baseregistry.baseregistry import BaseComponents
+
+
+try:
+    from importlib import metadata
+except ModuleNotFoundError:  # pragma: no cover
+    # Python 3.7
+    metadata = None
+
+
+SNAPSHOT_VERSION = 2
+
+
+def fingerprint(filenames):
+    """Compute a hash over the names and contents of the given files."""
+    digest = hashlib.sha256()
+    for filename in sorted(filenames):
+        digest.update(filename.encode('utf-8') + b'\0')
+        with open(filename, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def getPackageVersions():
+    """Return the Python version and the names and versions of all installed
+    distributions, as sorted ``(name, version)`` pairs."""
+    versions = {'Python': sys.version}
+    if metadata is None:  # pragma: no cover
+        import pkg_resources
+        for dist in pkg_resources.working_set:
+            versions[dist.project_name] = dist.version
+    else:
+        for dist in metadata.distributions():
+            versions[str(dist.metadata['Name'])] = dist.version
+    return sorted(versions.items())
+
+
+def getIncludedFiles(context):
+    """Return all ZCML files processed by the configuration context."""
+    return sorted(getattr(context, '_seen_files', ()))
+
+
+def getRegistries(parent=None):
+    """Return the parent registry and all base registries registered in it.
+    """
+    if parent is None:
+        parent = globalregistry.base
+    registries = [
+        util for name, util in sorted(parent.getUtilitiesFor(IComponents))
+        if isinstance(util, BaseComponents)]
+    return [parent] + registries
+
+
+def getRegistrations(components):
+    """Return the bases and all registrations of a components registry.
+
+    A registry which is still to be populated lazily is populated first.
+    """
+    populate = getattr(components, 'populate', None)
+    if populate is not None:
+        populate()
+    return {
+        'bases': tuple(components.__bases__),
+        'utilities': [
+            (reg.component, reg.provided, reg.name, reg.info)
+            for reg in components.registeredUtilities()],
+        'adapters': [
+            (reg.factory, reg.required, reg.provided, reg.name, reg.info)
+            for reg in components.registeredAdapters()],
+        'subscribers': [
+            (reg.factory, reg.required, reg.provided, reg.name, reg.info)
+            for reg in components.registeredSubscriptionAdapters()],
+        'handlers': [
+            (reg.handler, reg.required, reg.name, reg.info)
+            for reg in components.registeredHandlers()],
+    }
+
+
+def restoreRegistrations(components, state):
+    """Apply registrations collected by ``getRegistrations()``.
+
+    No registration events are sent.
+    """
+    components.__bases__ = state['bases']
+    for component, provided, name, info in state['utilities']:
+        components.registerUtility(
+            component, provided, name, info, event=False)
+    for factory, required, provided, name, info in state['adapters']:
+        components.registerAdapter(
+            factory, required, provided, name, info, event=False)
+    for factory, required, provided, name, info in state['subscribers']:
+        components.registerSubscriptionAdapter(
+            factory, required, provided, name, info, event=False)
+    for factory, required, name, info in state['handlers']:
+        components.registerHandler(
+            factory, required, name, info, event=False)
+
+
+def copyState(components):
+    """Return copies of the bases and registration tables of a registry.
+
+    The copies share the registration tuples with the registry.
+    """
+    return {
+        'bases': components.__bases__,
+        'utilities': dict(components._utility_registrations),
+        'adapters': dict(components._adapter_registrations),
+        'subscribers': list(components._subscription_registrations),
+        'handlers': list(components._handler_registrations),
+    }
+
+
+def _changedKeys(current, saved):
+    # The registrations are tuples which are copied into the state, so
+    # unchanged registrations are the very same objects.
+    changed = [key for key, value in current.items()
+               if saved.get(key) is not value]
+    return changed, saved.keys() - current.keys()
+
+
+def _restoreUtilities(components, saved):
+    current = components._utility_registrations
+    changed, missing = _changedKeys(current, saved)
+    cache = components._utility_registrations_cache
+    for provided, name in changed:
+        cache.unregisterUtility(
+            provided, name, current[(provided, name)][0])
+    for key in changed + list(missing):
+        if key in saved:
+            cache.registerUtility(key[0], key[1], *saved[key])
+            current[key] = saved[key]
+
+
+def _restoreAdapters(components, saved):
+    current = components._adapter_registrations
+    changed, missing = _changedKeys(current, saved)
+    for key in changed:
+        del current[key]
+        components.adapters.unregister(*key)
+    for key in changed + list(missing):
+        if key in saved:
+            current[key] = saved[key]
+            components.adapters.register(*key, saved[key][0])
+
+
+def _restoreSubscriptions(adapters, current, saved, getSubscription):
+    if current == saved:
+        return
+    common = 0
+    for old, new in zip(current, saved):
+        if old is not new:
+            break
+        common += 1
+    # Subscriptions cannot be removed one by one when a factory was
+    # subscribed several times, so resubscribe all affected factories in
+    # their original order.
+    affected = {getSubscription(entry)[:2]
+                for entry in current[common:] + saved[common:]}
+    for required, provided in affected:
+        adapters.unsubscribe(required, provided)
+    for entry in saved:
+        required, provided, factory = getSubscription(entry)
+        if (required, provided) in affected:
+            adapters.subscribe(required, provided, factory)
+    current[:] = saved
+
+
+def _getSubscriber(entry):
+    required, provided, name, factory, info = entry
+    return required, provided, factory
+
+
+def _getHandler(entry):
+    required, name, factory, info = entry
+    return required, None, factory
+
+
+def applyState(components, state):
+    """Make a registry match a state returned by ``copyState()``.
+
+    Registrations are compared by identity.  Only the registrations which
+    differ are unregistered and registered again, and dependent registries
+    are notified once.  No registration events are sent.
+    """
+    bulk = getattr(components, 'bulk', contextlib.nullcontext)
+    with bulk():
+        if components.__bases__ != state['bases']:
+            components.__bases__ = state['bases']
+        _restoreUtilities(components, state['utilities'])
+        _restoreAdapters(components, state['adapters'])
+        _restoreSubscriptions(
+            components.adapters, components._subscription_registrations,
+            state['subscribers'], _getSubscriber)
+        _restoreSubscriptions(
+            components.adapters, components._handler_registrations,
+            state['handlers'], _getHandler)
+
+
+def _registryTable(registries):
+    table = {'base': globalregistry.base}
+    for registry in registries:
+        if registry is globalregistry.base:
+            continue
+        if registry.__name__ in table:
+            raise ValueError(
+                'Duplicate registry name: %r' % registry.__name__)
+        table[registry.__name__] = registry
+    return table
+
+
+def saveSnapshot(filename, context, registries=None):
+    """Save the registrations of the given registries into a snapshot file.
+
+    The snapshot is keyed by the fingerprint of all ZCML files included by
+    the configuration ``context`` and by the versions of Python and of the
+    installed distributions.  Registries -- also those referenced as bases
+    or registered as components -- are stored by name only; all other
+    components must be picklable, otherwise ``pickle.PicklingError`` is
+    raised.
+    """
+    if registries is None:
+        registries = getRegistries()
+    table = _registryTable(registries)
+    names = {id(registry): name for name, registry in table.items()}
+    files = getIncludedFiles(context)
+    header = {
+        'version': SNAPSHOT_VERSION,
+        'files': files,
+        'fingerprint': fingerprint(files),
+        'packages': getPackageVersions(),
+    }
+    body = [(name, getRegistrations(registry))
+            for name, registry in table.items()]
+
+    with open(filename, 'wb') as f:
+        pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+        pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = lambda obj: names.get(id(obj))
+        pickler.dump(body)
+
+
+def loadSnapshot(filename, registries=()):
+    """Restore the registries from a snapshot file.
+
+    Return ``False`` if the snapshot is missing, out of date or cannot be
+    loaded, e.g. because a pickled class was renamed, in which case none of
+    the registries were touched and the ZCML must be executed as usual.
+    The registries are expected to be empty.
+    """
+    table = _registryTable(registries)
+    try:
+        with open(filename, 'rb') as f:
+            header = pickle.load(f)
+            if header.get('version') != SNAPSHOT_VERSION:
+                return False
+            if fingerprint(header['files']) != header['fingerprint']:
+                return False
+            if header['packages'] != getPackageVersions():
+                return False
+            unpickler = pickle.Unpickler(f)
+            unpickler.persistent_load = table.__getitem__
+            body = unpickler.load()
+    except Exception:
+        # Any snapshot which cannot be loaded is out of date.
+        return False
+
+    for name, state in body:
+        restoreRegistrations(table[name], state)
+    return True
@@ -0,0 +1,100 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""In-memory snapshots of registry state for test suites.
+
+A test layer executes its ZCML once, saves the state of the registries with
+``saveState()`` and calls ``restoreState()`` in ``tearDown`` instead of
+executing the ZCML again.  Registries whose adapter registries are the same
+objects with the same generations are skipped and the others are restored by
+undoing only the differences.
+
+"""
+__docformat__ = "reStructuredText"
+from z3c.baseregistry.snapshot import applyState
+from z3c.baseregistry.snapshot import copyState
+from z3c.baseregistry.snapshot import getRegistries
+
+
+def _getGenerations(components):
+    # Every registration and every change of the bases increases the
+    # generation of an adapter registry.
+    if not getattr(components, 'populated', True):
+        return None
+    return (components.adapters._generation,
+            components.utilities._generation)
+
+
+def _getAdapterRegistries(components):
+    # Reinitializing a registry, like ``zope.testing.cleanup`` does for the
+    # global registry, replaces its adapter registries and so starts their
+    # generations again.
+    if not getattr(components, 'populated', True):
+        return None
+    return (components.adapters, components.utilities)
+
+
+def _isUnchanged(components, state):
+    current = _getAdapterRegistries(components)
+    return (current is not None
+            and all(registry is saved for registry, saved in zip(
+                current, state['adapterRegistries']))
+            and _getGenerations(components) == state['generations'])
+
+
+def _getState(components):
+    state = copyState(components)
+    state['registry'] = components
+    state['generations'] = _getGenerations(components)
+    state['adapterRegistries'] = _getAdapterRegistries(components)
+    if state['generations'] is None:
+        state['deferred'] = list(components._deferred)
+    return state
+
+
+def saveState(registries=None):
+    """Save the registrations of the given registries in memory.
+
+    By default the global registry and all base registries registered in it
+    are saved.  The state of registries still to be populated lazily
+    consists of their deferred actions; they are not populated.
+    """
+    if registries is None:
+        registries = getRegistries()
+    return [_getState(registry) for registry in registries]
+
+
+def _restoreLazy(components, state):
+    if components.populated:
+        # Make the registry lazy again.
+        components._init_registries()
+        components._init_registrations()
+        components.__bases__ = state['bases']
+        for callable, args, kw in state['deferred']:
+            components.defer(callable, *args, **kw)
+    else:
+        components._deferred[:] = state['deferred']
+
+
+def restoreState(state):
+    """Restore the registrations saved by ``saveState()``.
+
+    Registrations made since are removed and removed or replaced
+    registrations are registered again.  No registration events are sent.
+    """
+    for registryState in state:
+        components = registryState['registry']
+        if registryState['generations'] is None:
+            _restoreLazy(components, registryState)
+        elif not _isUnchanged(components, registryState):
+            applyState(components, registryState)
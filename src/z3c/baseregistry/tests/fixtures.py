@@ -0,0 +1,72 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Components shared by the tests.
+
+All of them live at module level, so they can be referenced from ZCML and
+pickled.
+"""
+import zope.component
+import zope.interface
+
+
+class IExample(zope.interface.Interface):
+    pass
+
+
+class IAdapted(zope.interface.Interface):
+    pass
+
+
+@zope.interface.implementer(IExample)
+class Example:
+
+    def __init__(self, name=None):
+        self.name = name
+
+
+example = Example('example')
+one = Example('one')
+two = Example('two')
+three = Example('three')
+
+
+@zope.component.adapter(IExample)
+@zope.interface.implementer(IAdapted)
+def adapter(context):
+    return 'adapted'
+
+
+@zope.component.adapter(IExample)
+@zope.interface.implementer(IAdapted)
+def other(context):
+    return 'other'
+
+
+handled = []
+
+
+@zope.component.adapter(IExample)
+def handler(event):
+    handled.append(event)
+
+
+# Wrap the directives of a test in a configuration with the meta directives
+# of this package and of ``zope.component``.
+CONFIGURE = '''
+<configure xmlns="http://namespaces.zope.org/zope">
+  <include package="z3c.baseregistry" file="meta.zcml" />
+  <include package="zope.component" file="meta.zcml" />
+%s
+</configure>
+'''
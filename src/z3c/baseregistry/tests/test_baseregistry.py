@@ -0,0 +1,609 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import pickle
+import threading
+import unittest
+
+import zope.component
+import zope.interface
+import zope.interface.registry
+from zope.interface.interfaces import ComponentLookupError
+from zope.interface.interfaces import IComponents
+from zope.site.folder import Folder
+from zope.site.site import LocalSiteManager
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+
+
+class IExample(zope.interface.Interface):
+    pass
+
+
+class ISpecialExample(IExample):
+    pass
+
+
+class IAdapted(zope.interface.Interface):
+    pass
+
+
+@zope.interface.implementer(IExample)
+class Example:
+
+    def __init__(self, name):
+        self.name = name
+
+
+example1 = Example('example1')
+example2 = Example('example2')
+special = Example('special')
+zope.interface.directlyProvides(special, ISpecialExample)
+
+
+@zope.component.adapter(IExample)
+@zope.interface.implementer(IAdapted)
+def adapter(context):
+    return 'adapted'
+
+
+class TestBulk(CleanUp, unittest.TestCase):
+
+    def _makeOne(self, name='base', bases=()):
+        return baseregistry.BaseComponents(
+            zope.component.globalSiteManager, name, bases)
+
+    def test_dependents_are_invalidated_once(self):
+        registry = self._makeOne()
+        dependent = self._makeOne('dependent', (registry,))
+        self.assertIsNone(dependent.queryUtility(IExample))
+        generation = dependent.utilities._generation
+
+        with registry.bulk():
+            registry.registerUtility(example1, IExample)
+            registry.registerUtility(example2, IExample, 'example2')
+            # The registry itself is up to date ...
+            self.assertIs(example1, registry.getUtility(IExample))
+            # ... but dependents are not invalidated yet.
+            self.assertEqual(generation, dependent.utilities._generation)
+
+        self.assertEqual(generation + 1, dependent.utilities._generation)
+        self.assertIs(example1, dependent.getUtility(IExample))
+        self.assertIs(example2, dependent.getUtility(IExample, 'example2'))
+
+    def test_nested(self):
+        registry = self._makeOne()
+        dependent = self._makeOne('dependent', (registry,))
+        generation = dependent.utilities._generation
+
+        with registry.bulk():
+            with registry.bulk():
+                registry.registerUtility(example1, IExample)
+            self.assertEqual(generation, dependent.utilities._generation)
+
+        self.assertEqual(generation + 1, dependent.utilities._generation)
+
+    def test_no_changes(self):
+        registry = self._makeOne()
+        dependent = self._makeOne('dependent', (registry,))
+        generation = dependent.utilities._generation
+
+        with registry.bulk():
+            pass
+
+        self.assertEqual(generation, dependent.utilities._generation)
+
+    def test_error(self):
+        registry = self._makeOne()
+        with self.assertRaises(ValueError):
+            with registry.bulk():
+                raise ValueError()
+        self.assertEqual(0, registry.adapters._bulk)
+        self.assertEqual(0, registry.utilities._bulk)
+
+
+class TestNegativeLookups(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        gsm = zope.component.getGlobalSiteManager()
+        self.base = baseregistry.BaseComponents(gsm, 'base')
+        self.registry = baseregistry.BaseComponents(
+            gsm, 'registry', (self.base, gsm))
+        self.lookups = []
+        lookup = self.registry.utilities._v_lookup
+        uncached = lookup._uncached_lookup
+
+        def countingLookup(*args):
+            self.lookups.append(args)
+            return uncached(*args)
+        lookup._uncached_lookup = countingLookup
+
+    def test_misses_are_cached(self):
+        self.assertIsNone(self.registry.queryUtility(IExample, 'optional'))
+        self.assertIsNone(self.registry.queryUtility(IExample, 'optional'))
+        self.assertEqual(1, len(self.lookups))
+
+    def test_local_site_managers_are_not_notified(self):
+        site = Folder()
+        site.setSiteManager(LocalSiteManager(site))
+        sm = site.getSiteManager()
+        sm.__bases__ = (self.registry,)
+        self.assertIsNone(sm.queryUtility(IExample, 'optional'))
+
+        notified = []
+        sm.utilities.changed = notified.append
+        self.base.registerUtility(example1, IExample, 'optional')
+        self.assertEqual([], notified)
+        self.assertIs(example1, sm.queryUtility(IExample, 'optional'))
+
+    def test_misses_are_invalidated_by_bases(self):
+        self.assertIsNone(self.registry.queryUtility(IExample, 'optional'))
+        self.base.registerUtility(example1, IExample, 'optional')
+        self.assertIs(example1,
+                      self.registry.queryUtility(IExample, 'optional'))
+        zope.component.provideUtility(example2, IExample, 'global')
+        self.assertIs(example2,
+                      self.registry.queryUtility(IExample, 'global'))
+        self.assertEqual(3, len(self.lookups))
+
+
+class TestLazy(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = baseregistry.BaseComponents(
+            zope.component.getGlobalSiteManager(), 'lazy')
+
+    def test_populated_by_default(self):
+        self.assertTrue(self.registry.populated)
+        self.registry.populate()
+        self.assertTrue(self.registry.populated)
+
+    def test_defer(self):
+        self.registry.defer(self.registry.registerUtility, example1, IExample)
+        self.assertFalse(self.registry.populated)
+        self.assertNotIn('utilities', self.registry.__dict__)
+        self.registry.populate()
+        self.assertTrue(self.registry.populated)
+        self.assertIs(example1, self.registry.getUtility(IExample))
+
+    def test_populated_on_access(self):
+        self.registry.defer(self.registry.registerUtility, example1, IExample)
+        self.assertIs(example1, self.registry.getUtility(IExample))
+        self.assertEqual(0, self.registry.utilities._bulk)
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.registry.missing
+        self.registry.defer(self.registry.registerUtility, example1, IExample)
+        with self.assertRaises(AttributeError):
+            self.registry.missing
+        self.assertFalse(self.registry.populated)
+
+    def test_failing_action(self):
+        def fail():
+            raise ValueError('fail')
+        self.registry.defer(self.registry.registerUtility, example1, IExample)
+        self.registry.defer(fail)
+        with self.assertRaises(ValueError):
+            self.registry.getUtility(IExample)
+        self.assertFalse(self.registry.populated)
+        self.assertNotIn('utilities', self.registry.__dict__)
+        self.assertEqual(2, len(self.registry._deferred))
+        self.assertIsNone(self.registry._populating)
+        with self.assertRaises(ValueError):
+            self.registry.populate()
+
+    def test_hidden_while_populating(self):
+        started = threading.Event()
+        proceed = threading.Event()
+        results = []
+
+        def wait():
+            started.set()
+            proceed.wait(5)
+
+        def lookup():
+            results.append(self.registry.queryUtility(IExample, 'last'))
+
+        self.registry.defer(self.registry.registerUtility, example1, IExample)
+        self.registry.defer(wait)
+        self.registry.defer(
+            self.registry.registerUtility, example2, IExample, 'last')
+        populating = threading.Thread(target=self.registry.populate)
+        populating.start()
+        self.assertTrue(started.wait(5))
+        self.assertNotIn('utilities', self.registry.__dict__)
+        looking = threading.Thread(target=lookup)
+        looking.start()
+        looking.join(0.05)
+        self.assertTrue(looking.is_alive())
+        proceed.set()
+        populating.join(5)
+        looking.join(5)
+        self.assertEqual([example2], results)
+        self.assertTrue(self.registry.populated)
+
+    def test_with_dependents(self):
+        dependent = baseregistry.BaseComponents(
+            self.registry.__parent__, 'dependent', (self.registry,))
+        self.registry.defer(self.registry.registerUtility, example1, IExample)
+        self.assertTrue(self.registry.populated)
+        self.assertIs(example1, dependent.getUtility(IExample))
+
+    def test_published_before_populated(self):
+        published = []
+
+        class Registry(baseregistry.BaseComponents):
+            def __delattr__(self, name):
+                if name == '_lazyRegistries':
+                    published.append('utilities' in self.__dict__)
+                super().__delattr__(name)
+
+        registry = Registry(self.registry.__parent__, 'lazy')
+        registry.defer(registry.registerUtility, example1, IExample)
+        self.assertIs(example1, registry.getUtility(IExample))
+        self.assertEqual([True], published)
+
+    def test_reinit(self):
+        self.registry.defer(self.registry.registerUtility, example1, IExample)
+        self.registry.__init__(self.registry.__parent__, 'lazy')
+        self.assertTrue(self.registry.populated)
+        self.assertIsNone(self.registry.queryUtility(IExample))
+
+
+class TestFreeze(CleanUp, unittest.TestCase):
+
+    def _makeOne(self, name='base', bases=()):
+        return baseregistry.BaseComponents(
+            zope.component.globalSiteManager, name, bases)
+
+    def _makeFrozen(self):
+        base = self._makeOne('base')
+        base.registerUtility(example1, IExample)
+        base.registerUtility(example1, IExample, 'example1')
+        registry = self._makeOne('registry', (base,))
+        registry.registerUtility(example2, IExample)
+        registry.registerAdapter(adapter)
+        registry.freeze()
+        return base, registry
+
+    def test_lookups(self):
+        base, registry = self._makeFrozen()
+        self.assertTrue(registry.frozen)
+        self.assertIs(example2, registry.getUtility(IExample))
+        self.assertIs(example1, registry.getUtility(IExample, 'example1'))
+        self.assertIsNone(registry.queryUtility(IExample, 'missing'))
+        self.assertIsNone(registry.queryUtility(IAdapted))
+        with self.assertRaises(ComponentLookupError):
+            registry.getUtility(IExample, 'missing')
+        self.assertEqual(
+            [('', example2), ('example1', example1)],
+            sorted(registry.getUtilitiesFor(IExample),
+                   key=lambda item: item[0]))
+        self.assertEqual('adapted', registry.getAdapter(example1, IAdapted))
+
+    def test_lookups_use_table(self):
+        base, registry = self._makeFrozen()
+        self.assertEqual(
+            {'': example2, 'example1': example1},
+            registry.utilities._lookupTable[IExample])
+        self.assertIsNone(registry.adapters._lookupTable)
+        self.assertIsNone(registry.adapters._getLookupTable())
+
+    def test_adapters_without_table(self):
+        registry = self._makeOne()
+        registry.registerAdapter(lambda: 'null', (), IAdapted)
+        registry.registerAdapter(adapter)
+        registry.freeze()
+        self.assertIsNone(registry.adapters._lookupTable)
+        registry.adapters._v_lookup._uncached_lookup = None
+        self.assertIs(adapter, registry.adapters.lookup((IExample,), IAdapted))
+
+    def test_extending_interfaces(self):
+        base, registry = self._makeFrozen()
+        base.registerUtility(special, ISpecialExample, 'special')
+        self.assertIs(special, registry.getUtility(IExample, 'special'))
+        self.assertIs(special, registry.getUtility(ISpecialExample, 'special'))
+
+    def test_registrations_are_rejected(self):
+        base, registry = self._makeFrozen()
+        with self.assertRaises(baseregistry.FrozenRegistryError):
+            registry.registerUtility(example1, IExample, 'other')
+        with self.assertRaises(baseregistry.FrozenRegistryError):
+            registry.unregisterUtility(example2, IExample)
+        with self.assertRaises(baseregistry.FrozenRegistryError):
+            registry.registerAdapter(adapter, name='other')
+        with self.assertRaises(baseregistry.FrozenRegistryError):
+            registry.unregisterAdapter(adapter)
+        with self.assertRaises(baseregistry.FrozenRegistryError):
+            registry.registerSubscriptionAdapter(adapter)
+        with self.assertRaises(baseregistry.FrozenRegistryError):
+            registry.unregisterSubscriptionAdapter(adapter)
+        with self.assertRaises(baseregistry.FrozenRegistryError):
+            registry.registerHandler(adapter)
+        with self.assertRaises(baseregistry.FrozenRegistryError):
+            registry.unregisterHandler(adapter)
+        with self.assertRaises(baseregistry.FrozenRegistryError):
+            registry.__bases__ = ()
+        self.assertIs(example2, registry.getUtility(IExample))
+        self.assertEqual([], list(registry.getUtilitiesFor(IAdapted)))
+
+    def test_not_frozen(self):
+        registry = self._makeOne()
+        self.assertFalse(registry.frozen)
+        self.assertIs(zope.interface.registry.Components.queryUtility,
+                      registry.queryUtility.__func__)
+        registry.registerUtility(example1, IExample)
+        self.assertEqual([('', example1)],
+                         list(registry.getUtilitiesFor(IExample)))
+        self.assertTrue(registry.unregisterUtility(example1, IExample))
+        registry.registerAdapter(adapter)
+        self.assertTrue(registry.unregisterAdapter(adapter))
+        registry.registerSubscriptionAdapter(adapter)
+        self.assertTrue(registry.unregisterSubscriptionAdapter(adapter))
+        registry.registerHandler(adapter)
+        self.assertTrue(registry.unregisterHandler(adapter))
+
+    def test_base_changes(self):
+        base, registry = self._makeFrozen()
+        base.registerUtility(example2, IExample, 'example2')
+        self.assertIsNone(registry.utilities._lookupTable)
+        self.assertIs(example2, registry.getUtility(IExample, 'example2'))
+        self.assertIsNotNone(registry.utilities._lookupTable)
+        base.unregisterUtility(example2, IExample, 'example2')
+        self.assertEqual([('', example2), ('example1', example1)],
+                         sorted(registry.getUtilitiesFor(IExample),
+                                key=lambda item: item[0]))
+
+    def test_reinitialize(self):
+        base, registry = self._makeFrozen()
+        registry.__init__(zope.component.globalSiteManager, 'registry')
+        self.assertFalse(registry.frozen)
+        self.assertNotIn('queryUtility', registry.__dict__)
+        registry.registerUtility(example1, IExample)
+        self.assertIs(example1, registry.getUtility(IExample))
+
+
+class TestDelta(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        gsm = zope.component.getGlobalSiteManager()
+        self.shared = baseregistry.BaseComponents(gsm, 'shared')
+        self.shared.registerUtility(example1, IExample)
+        self.shared.registerUtility(example1, IExample, 'other')
+        self.shared.registerAdapter(adapter)
+        self.delta = baseregistry.DeltaComponents(gsm, 'delta', self.shared)
+        self.lookups = []
+        for registry in (self.delta.utilities, self.delta.adapters):
+            lookup = registry._v_lookup
+            lookup._uncached_lookup = self._counting(lookup._uncached_lookup)
+
+    def _counting(self, uncached):
+        def countingLookup(*args):
+            self.lookups.append(args)
+            return uncached(*args)
+        return countingLookup
+
+    def test_bases(self):
+        self.assertIs(self.shared, self.delta.shared)
+        self.assertEqual((self.shared,), self.delta.__bases__)
+        with self.assertRaises(ValueError):
+            self.delta.__bases__ = (self.shared, self.shared)
+
+    def test_delegated_lookups(self):
+        self.assertIs(example1, self.delta.getUtility(IExample))
+        self.assertIsNone(self.delta.queryUtility(IExample, 'missing'))
+        with self.assertRaises(ComponentLookupError):
+            self.delta.getUtility(IExample, 'missing')
+        self.assertEqual([('', example1), ('other', example1)],
+                         sorted(self.delta.getUtilitiesFor(IExample),
+                                key=lambda item: item[0]))
+        self.assertEqual('adapted', self.delta.getAdapter(example1, IAdapted))
+        self.assertEqual('adapted',
+                         self.delta.getMultiAdapter((example1,), IAdapted))
+        self.assertEqual([('', 'adapted')],
+                         list(self.delta.getAdapters((example1,), IAdapted)))
+        self.assertEqual([], self.lookups)
+
+    def test_overridden_utilities(self):
+        self.delta.registerUtility(example2, IExample)
+        self.delta.registerUtility(special, ISpecialExample, 'special')
+        self.assertIs(example2, self.delta.getUtility(IExample))
+        self.assertIs(special, self.delta.getUtility(IExample, 'special'))
+        self.assertIs(example1, self.delta.getUtility(IExample, 'other'))
+        self.assertIs(example1, self.shared.getUtility(IExample))
+        self.assertEqual(
+            [('', example2), ('other', example1), ('special', special)],
+            sorted(self.delta.getUtilitiesFor(IExample),
+                   key=lambda item: item[0]))
+
+        self.delta.unregisterUtility(example2, IExample)
+        self.assertIs(example1, self.delta.getUtility(IExample))
+
+    def test_overridden_adapters(self):
+        def other(context):
+            return 'other'
+        self.delta.registerAdapter(other, (IExample,), IAdapted, 'other')
+        self.assertEqual('other',
+                         self.delta.getAdapter(example1, IAdapted, 'other'))
+        self.assertEqual('adapted', self.delta.getAdapter(example1, IAdapted))
+        self.assertEqual(
+            [('', 'adapted'), ('other', 'other')],
+            sorted(self.delta.getAdapters((example1,), IAdapted)))
+        with self.assertRaises(ComponentLookupError):
+            self.delta.getAdapter(example1, IAdapted, 'missing')
+        with self.assertRaises(ComponentLookupError):
+            self.delta.getMultiAdapter((example1,), IAdapted, 'missing')
+
+    def test_compact_decisions(self):
+        self.delta.registerUtility(example2, IExample)
+        for name in ('', 'other', 'missing'):
+            self.delta.queryUtility(IExample, name)
+        generation, provides = self.delta._provided['utilities']
+        self.assertEqual(self.delta.utilities._generation, generation)
+        self.assertEqual({IExample: {''}, zope.interface.Interface: {''}},
+                         provides)
+
+    def test_shared_changes(self):
+        self.assertIsNone(self.delta.queryUtility(IExample, 'new'))
+        self.shared.registerUtility(example2, IExample, 'new')
+        self.assertIs(example2, self.delta.getUtility(IExample, 'new'))
+
+    def test_frozen(self):
+        self.delta.registerUtility(example2, IExample)
+        self.delta.freeze()
+        self.assertIs(example2, self.delta.getUtility(IExample))
+        self.assertIs(example1, self.delta.getUtility(IExample, 'other'))
+
+    def test_pickle(self):
+        gsm = zope.component.getGlobalSiteManager()
+        gsm.registerUtility(self.delta, IComponents, 'delta')
+        self.assertIs(self.delta, pickle.loads(pickle.dumps(self.delta)))
+
+
+class TestBC(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.gsm = zope.component.getGlobalSiteManager()
+        self.registry = baseregistry.BaseComponents(self.gsm, 'bccache')
+        self.gsm.registerUtility(self.registry, IComponents, 'bccache')
+
+    def test_resolve(self):
+        self.assertIs(self.registry, baseregistry.BC(self.gsm, 'bccache'))
+
+    def test_registration_changes(self):
+        baseregistry.BC(self.gsm, 'bccache')
+        other = baseregistry.BaseComponents(self.gsm, 'bccache')
+        self.gsm.registerUtility(other, IComponents, 'bccache')
+        self.assertIs(other, baseregistry.BC(self.gsm, 'bccache'))
+
+        self.gsm.unregisterUtility(other, IComponents, 'bccache')
+        with self.assertRaises(ComponentLookupError):
+            baseregistry.BC(self.gsm, 'bccache')
+
+    def test_base_registration_changes(self):
+        parent = baseregistry.BaseComponents(self.gsm, 'parent', (self.gsm,))
+        self.assertIs(self.registry, baseregistry.BC(parent, 'bccache'))
+        other = baseregistry.BaseComponents(self.gsm, 'bccache')
+        self.gsm.registerUtility(other, IComponents, 'bccache')
+        self.assertIs(other, baseregistry.BC(parent, 'bccache'))
+
+
+# The registry "parent" as pickled by earlier versions
+LEGACY = (
+    b'\x80\x03cz3c.baseregistry.baseregistry\nBC\nq\x00'
+    b'czope.component.globalregistry\nbase\nq\x01'
+    b'X\x06\x00\x00\x00parentq\x02\x86q\x03Rq\x04.')
+
+
+class TestReferences(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.gsm = zope.component.getGlobalSiteManager()
+        self.parent = baseregistry.BaseComponents(self.gsm, 'parent')
+        self.gsm.registerUtility(self.parent, IComponents, 'parent')
+        self.child = baseregistry.BaseComponents(self.parent, 'child')
+        self.parent.registerUtility(self.child, IComponents, 'child')
+
+    def test_compact(self):
+        self.assertEqual((baseregistry.BR, ('parent',)),
+                         self.parent.__reduce__())
+        self.assertEqual((baseregistry.BR, ('parent/child',)),
+                         self.child.__reduce__())
+        self.assertEqual((baseregistry.BR, ('parent/child', 'adapters')),
+                         self.child.adapters.__reduce__())
+        self.assertLess(len(pickle.dumps(self.parent, 3)), len(LEGACY))
+
+    def test_getReferenceId(self):
+        self.assertEqual('', baseregistry.getReferenceId(self.gsm))
+        self.assertEqual('parent/child',
+                         baseregistry.getReferenceId(self.child))
+        self.assertIs(self.gsm, baseregistry.BR(''))
+        self.assertIs(self.child, baseregistry.BR('parent/child'))
+        self.assertIsNone(baseregistry.getReferenceId(
+            baseregistry.BaseComponents(self.gsm, '')))
+        site = Folder()
+        site.setSiteManager(LocalSiteManager(site))
+        sm = site.getSiteManager()
+        self.assertIsNone(baseregistry.getReferenceId(sm))
+        self.assertIsNone(baseregistry.getReferenceId(
+            baseregistry.BaseComponents(sm, 'local')))
+
+    def test_loads(self):
+        objects = (self.parent, self.child, self.child.adapters,
+                   self.child.utilities)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            loaded = pickle.loads(pickle.dumps(objects, protocol))
+            for expected, registry in zip(objects, loaded):
+                self.assertIs(expected, registry)
+        self.assertEqual(['parent', 'parent/child'],
+                         sorted(baseregistry._brTable))
+
+    def test_legacy(self):
+        self.assertIs(self.parent, pickle.loads(LEGACY))
+
+    def test_fallback(self):
+        slashed = baseregistry.BaseComponents(self.gsm, 'a/b')
+        self.assertEqual((baseregistry.BC, (self.gsm, 'a/b')),
+                         slashed.__reduce__())
+        local = baseregistry.BaseComponents(Folder(), 'local')
+        self.assertIs(baseregistry.BC, local.__reduce__()[0])
+        adapters = baseregistry.BaseComponentsAdapterRegistry(
+            self.gsm, 'adapters')
+        self.assertIsNot(baseregistry.BR, adapters.__reduce__()[0])
+
+    def test_invalidated(self):
+        jar = pickle.dumps(self.child)
+        self.assertIs(self.child, pickle.loads(jar))
+        other = baseregistry.BaseComponents(self.parent, 'child')
+        self.parent.registerUtility(other, IComponents, 'child')
+        self.assertIs(other, pickle.loads(jar))
+        self.assertEqual(['parent/child'], list(baseregistry._brTable))
+
+    def test_invalidated_by_base(self):
+        base = baseregistry.BaseComponents(self.gsm, 'base')
+        base.registerUtility(self.child, IComponents, 'inherited')
+        self.parent.__bases__ = (base,)
+        self.assertIs(self.child, baseregistry.BR('parent/inherited'))
+        base.registerUtility(self.parent, IComponents, 'inherited')
+        self.assertIs(self.parent, baseregistry.BR('parent/inherited'))
+
+    def test_buildReferenceTable(self):
+        lazy = baseregistry.BaseComponents(self.gsm, 'lazy')
+        lazy.defer(lazy.registerUtility, Example('lazy'), IExample)
+        self.gsm.registerUtility(lazy, IComponents, 'lazy')
+        self.gsm.registerUtility(self.child, IComponents, 'other')
+        self.assertEqual(3, baseregistry.buildReferenceTable())
+        self.assertFalse(lazy.populated)
+        table = dict(baseregistry._brTable)
+        self.assertEqual(['lazy', 'parent', 'parent/child'], sorted(table))
+
+        self.assertIs(self.child, pickle.loads(pickle.dumps(self.child)))
+        self.assertIs(lazy, pickle.loads(pickle.dumps(lazy)))
+        for id, resolved in table.items():
+            self.assertIs(resolved, baseregistry._brTable[id])
+
+    def test_clearReferenceTable(self):
+        pickle.loads(pickle.dumps(self.child))
+        baseregistry.clearReferenceTable()
+        self.assertEqual({}, baseregistry._brTable)
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
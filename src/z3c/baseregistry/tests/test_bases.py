@@ -0,0 +1,209 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import unittest
+
+import zope.component
+import zope.interface
+from zope.interface import ro
+from zope.interface.registry import Components
+from zope.site.folder import Folder
+from zope.site.site import LocalSiteManager
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import bases
+from z3c.baseregistry import catalog
+
+
+class IExample(zope.interface.Interface):
+    pass
+
+
+@zope.interface.implementer(IExample)
+class Example:
+    pass
+
+
+class Jar:
+    """A data manager recording the changed objects."""
+
+    def __init__(self):
+        self.registered = []
+
+    def register(self, obj):
+        self.registered.append(obj)
+
+
+def makeSiteManager(container, name):
+    container[name] = site = Folder()
+    site.setSiteManager(LocalSiteManager(site))
+    return site.getSiteManager()
+
+
+class TestSetBases(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.gsm = zope.component.getGlobalSiteManager()
+        self.one = baseregistry.BaseComponents(self.gsm, 'one', (self.gsm,))
+        self.two = baseregistry.BaseComponents(self.gsm, 'two', (self.gsm,))
+        self.example = Example()
+        self.two.registerUtility(self.example, IExample)
+        self.root = Folder()
+        self.root.setSiteManager(LocalSiteManager(self.root))
+        self.index = catalog.installIndex(self.root)
+        self.siteManagers = [makeSiteManager(self.root, 'site%d' % i)
+                             for i in range(5)]
+
+    def test_setBases(self):
+        self.siteManagers[0].__bases__ = (self.two, self.gsm)
+        stats = bases.setBases(self.siteManagers, (self.two, self.gsm))
+        self.assertEqual(4, stats['changed'])
+        self.assertEqual(1, stats['unchanged'])
+        self.assertEqual(1, stats['groups'])
+        self.assertGreaterEqual(stats['perSecond'], 0)
+        for sm in self.siteManagers:
+            self.assertIs(self.example, sm.getUtility(IExample))
+        self.assertIs(self.siteManagers[1].__bases__,
+                      self.siteManagers[4].__bases__)
+        self.assertEqual(4, len(self.index.getDependents(self.two)))
+
+    def test_shared_orders(self):
+        rootSm = self.root.getSiteManager()
+        stats = bases.setBases(self.siteManagers, (rootSm, self.two))
+        self.assertEqual(1, stats['groups'])
+        self.assertEqual(tuple(self.siteManagers), rootSm.subs)
+        other = Example()
+        self.two.registerUtility(other, IExample, 'other')
+        rootSm.registerUtility(other, IExample, 'root')
+        for sm in self.siteManagers:
+            self.assertIs(sm.__bases__, self.siteManagers[0].__bases__)
+            self.assertEqual(ro.ro(sm.adapters), sm.adapters.ro)
+            self.assertEqual(ro.ro(sm.utilities), sm.utilities.ro)
+            self.assertIs(other, sm.getUtility(IExample, 'other'))
+            self.assertIs(other, sm.getUtility(IExample, 'root'))
+
+        bases.setBases(self.siteManagers, (self.one,))
+        self.assertEqual((), rootSm.subs)
+        for sm in self.siteManagers:
+            self.assertEqual(ro.ro(sm.utilities), sm.utilities.ro)
+            self.assertIsNone(sm.queryUtility(IExample, 'other'))
+        self.assertEqual(5, len(self.index.getDependents(self.one)))
+
+        sm = self.siteManagers[0]
+        stats = bases.setBases(
+            [self.siteManagers[1], sm] + self.siteManagers[2:],
+            lambda changed: (self.two,) if changed is sm else (sm,))
+        self.assertEqual(2, stats['groups'])
+        for changed in self.siteManagers[2:]:
+            self.assertEqual(ro.ro(changed.utilities), changed.utilities.ro)
+        self.assertIs(other, self.siteManagers[4].getUtility(
+            IExample, 'other'))
+
+        sm = Components('plain')
+        stats = bases.setBases([sm] + self.siteManagers, (self.one,))
+        self.assertEqual(6, stats['changed'])
+        self.assertIs(sm.__bases__, self.siteManagers[4].__bases__)
+        self.assertEqual(ro.ro(sm.utilities)[1:],
+                         self.siteManagers[4].utilities.ro[1:])
+
+    def test_batches(self):
+        commits = []
+        reports = []
+        stats = bases.setBases(
+            self.siteManagers, (self.one,), batchSize=2,
+            commit=lambda: commits.append(1), progress=reports.append)
+        self.assertEqual(3, len(commits))
+        self.assertEqual([2, 4], [report['changed'] for report in reports])
+        self.assertEqual(5, stats['changed'])
+
+    def test_batches_without_commit(self):
+        stats = bases.setBases(self.siteManagers, (self.one,), batchSize=5)
+        self.assertEqual(5, stats['changed'])
+
+    def test_replacingBase(self):
+        for sm in self.siteManagers:
+            catalog.indexSiteManager(sm)
+        self.siteManagers[0].__bases__ = (self.one, self.gsm)
+        getBases = bases.replacingBase(self.gsm, (self.two, self.gsm))
+        self.assertEqual([self.one, self.two, self.gsm],
+                         getBases(self.siteManagers[0]))
+        self.assertEqual([self.gsm], bases.replacingBase(
+            self.one, (self.gsm,))(self.siteManagers[0]))
+
+        stats = bases.setBases(
+            catalog.getDependents(self.gsm, self.root), getBases)
+        self.assertEqual(6, stats['changed'])
+        self.assertEqual(2, stats['groups'])
+        self.assertEqual((self.one, self.two, self.gsm),
+                         self.siteManagers[0].__bases__)
+        self.assertEqual((self.two, self.gsm),
+                         self.siteManagers[1].__bases__)
+
+    def test_migrateReferences(self):
+        for sm in self.siteManagers[1:]:
+            sm.__bases__ = (self.two, self.gsm)
+        jar = Jar()
+        for i, sm in enumerate(self.siteManagers):
+            for j, registry in enumerate((sm, sm.adapters, sm.utilities)):
+                registry._p_jar = jar
+                registry._p_oid = bytes([i, j])
+        commits = []
+        migrated = bases.migrateReferences(
+            self.siteManagers, batchSize=3, commit=lambda: commits.append(1))
+        self.assertEqual(4, migrated)
+        self.assertEqual(2, len(commits))
+        self.assertEqual(
+            [registry for sm in self.siteManagers[1:]
+             for registry in (sm, sm.adapters, sm.utilities)],
+            jar.registered)
+
+        self.assertEqual(2, bases.migrateReferences(
+            self.siteManagers[1:3], batchSize=2,
+            commit=lambda: commits.append(2)))
+        self.assertEqual(3, len(commits))
+        self.assertEqual(4, bases.migrateReferences(self.siteManagers))
+
+
+class TestBulkBasesPage(CleanUp, unittest.TestCase):
+
+    def test_getDependents(self):
+        from zope.publisher.browser import TestRequest
+
+        from z3c.baseregistry.browser.base import BulkBasesPage
+        gsm = zope.component.getGlobalSiteManager()
+        custom = baseregistry.BaseComponents(gsm, 'custom', (gsm,))
+        root = Folder()
+        root.setSiteManager(LocalSiteManager(root))
+        root['site'] = site = Folder()
+        site.setSiteManager(LocalSiteManager(site))
+        site['nested'] = nested = Folder()
+        nested.setSiteManager(LocalSiteManager(nested))
+        root['other'] = other = Folder()
+        other.setSiteManager(LocalSiteManager(other))
+        for folder in (site, nested, other):
+            folder.getSiteManager().__bases__ = (custom,)
+
+        for index in (None, catalog.installIndex(root)):
+            page = BulkBasesPage(site.getSiteManager(), TestRequest())
+            self.assertEqual(
+                [site.getSiteManager(), nested.getSiteManager()],
+                page.getDependents(custom))
+            page = BulkBasesPage(root.getSiteManager(), TestRequest())
+            self.assertEqual(3, len(page.getDependents(custom)))
+            self.assertEqual([root.getSiteManager()], page.getDependents(gsm))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -0,0 +1,178 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import unittest
+
+import zope.component
+import zope.component.event
+import zope.lifecycleevent
+from zope.component.interfaces import ISite
+from zope.interface.interfaces import ComponentLookupError
+from zope.interface.interfaces import IComponents
+from zope.lifecycleevent.interfaces import IObjectModifiedEvent
+from zope.lifecycleevent.interfaces import IObjectRemovedEvent
+from zope.site.folder import Folder
+from zope.site.interfaces import ILocalSiteManager
+from zope.site.interfaces import INewLocalSite
+from zope.site.site import LocalSiteManager
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import catalog
+
+
+class TestCatalog(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.gsm = zope.component.getGlobalSiteManager()
+        self.custom = baseregistry.BaseComponents(self.gsm, 'custom')
+        self.gsm.registerUtility(self.custom, IComponents, 'custom')
+
+    def _makeSiteManager(self):
+        site = Folder()
+        site.setSiteManager(LocalSiteManager(site))
+        return site.getSiteManager()
+
+    def test_getRegistries(self):
+        registries = catalog.getRegistries(self.gsm)
+        self.assertEqual((('custom', self.custom),), registries)
+        self.assertIs(registries, catalog.getRegistries(self.gsm))
+
+    def test_getRegistries_invalidated(self):
+        sm = self._makeSiteManager()
+        registries = catalog.getRegistries(sm)
+        other = baseregistry.BaseComponents(self.gsm, 'other')
+        self.gsm.registerUtility(other, IComponents, 'other')
+        self.assertEqual(
+            [('custom', self.custom), ('other', other)],
+            sorted(catalog.getRegistries(sm)))
+        registries = catalog.getRegistries(sm)
+        sm.__bases__ = (self.custom, self.gsm)
+        self.assertIsNot(registries, catalog.getRegistries(sm))
+
+    def _makeRoot(self):
+        root = Folder()
+        root.setSiteManager(LocalSiteManager(root))
+        self.index = catalog.installIndex(root)
+        return root
+
+    def _makeSite(self, container, name):
+        container[name] = site = Folder()
+        site.setSiteManager(LocalSiteManager(site))
+        return site
+
+    def test_dependents(self):
+        root = self._makeRoot()
+        sm = self._makeSite(root, 'site').getSiteManager()
+        self.assertEqual([], catalog.getDependents(self.custom, root))
+        sm.__bases__ = (self.custom, self.gsm)
+        catalog.indexSiteManager(sm)
+        self.assertEqual([sm], catalog.getDependents(self.custom, root))
+        self.assertEqual([root.getSiteManager(), sm],
+                         catalog.getDependents(self.gsm, sm))
+        self.assertEqual(['', 'custom'], sorted(
+            key for key in self.index._dependents if isinstance(key, str)))
+
+        sm.__bases__ = (self.gsm,)
+        self.assertEqual([], catalog.getDependents(self.custom, root))
+        catalog.indexSiteManager(sm)
+        self.assertEqual([], self.index.getDependents(self.custom))
+        self.assertEqual([root.getSiteManager(), sm],
+                         self.index.getDependents(self.gsm))
+
+    def test_local_base(self):
+        root = self._makeRoot()
+        site = self._makeSite(root, 'site')
+        nested = self._makeSite(site, 'nested')
+        site.getSiteManager().__bases__ = (root.getSiteManager(),)
+        nested.getSiteManager().__bases__ = (site.getSiteManager(),)
+        catalog.indexSites(site)
+        self.assertEqual([site.getSiteManager()],
+                         catalog.getDependents(root.getSiteManager(), root))
+        self.assertEqual([nested.getSiteManager()],
+                         catalog.getDependents(site.getSiteManager(), root))
+
+    def test_no_index(self):
+        sm = self._makeSiteManager()
+        catalog.indexSiteManager(sm)
+        self.assertIsNone(catalog.getIndex(sm))
+        self.assertRaises(ComponentLookupError,
+                          catalog.getDependents, self.gsm, sm)
+
+    def test_indexSites(self):
+        root = Folder()
+        root['folder'] = Folder()
+        site = self._makeSite(root['folder'], 'site')
+        nested = self._makeSite(site, 'nested')
+        other = self._makeSite(root, 'other')
+        sm = site.getSiteManager()
+        sm.__bases__ = (self.custom, self.gsm)
+        nested.getSiteManager().__bases__ = (sm,)
+        root.setSiteManager(LocalSiteManager(root))
+        self.assertEqual([], catalog.indexSites(Folder()))
+
+        index = catalog.installIndex(root)
+        self.assertEqual([sm], index.getDependents(self.custom))
+        self.assertEqual([nested.getSiteManager()],
+                         index.getDependents(sm))
+        self.assertEqual(
+            [root.getSiteManager(), sm, nested.getSiteManager(),
+             other.getSiteManager()],
+            catalog.indexSites(root))
+        self.assertEqual([sm], catalog.findSiteManagers(site)[:1])
+        self.assertEqual([], catalog.findSiteManagers(object()))
+
+    def test_new_local_site(self):
+        zope.component.provideHandler(catalog.newLocalSite, (INewLocalSite,))
+        root = self._makeRoot()
+        sm = self._makeSite(root, 'site').getSiteManager()
+        self.assertEqual([root.getSiteManager(), sm],
+                         self.index.getDependents(self.gsm))
+
+    def test_site_removed(self):
+        zope.component.provideHandler(zope.component.event.objectEventNotify)
+        zope.component.provideHandler(
+            catalog.siteRemoved, (ISite, IObjectRemovedEvent))
+        root = self._makeRoot()
+        sm = self._makeSite(root, 'site').getSiteManager()
+        catalog.indexSiteManager(sm)
+        del root['site']
+        self.assertEqual([root.getSiteManager()],
+                         self.index.getDependents(self.gsm))
+        self.index.unindex(sm)
+        self.assertEqual([root.getSiteManager()],
+                         self.index.getDependents(self.gsm))
+        plain = Folder()
+        self._makeSite(plain, 'site')
+        del plain['site']
+
+    def test_vocabulary(self):
+        from z3c.baseregistry.browser import base
+        zope.component.provideHandler(zope.component.event.objectEventNotify)
+        zope.component.provideHandler(
+            base.basesModified, (ILocalSiteManager, IObjectModifiedEvent))
+        sm = self._makeSite(self._makeRoot(), 'site').getSiteManager()
+        vocabulary = base.baseComponentsVocabulary(sm)
+        self.assertIs(vocabulary, base.baseComponentsVocabulary(sm))
+        self.assertEqual([self.custom, self.gsm],
+                         [term.value for term in vocabulary])
+
+        sm.__bases__ = (self.custom, self.gsm)
+        zope.lifecycleevent.modified(sm)
+        self.assertIsNot(vocabulary, base.baseComponentsVocabulary(sm))
+        self.assertEqual([sm], self.index.getDependents(self.custom))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -0,0 +1,97 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import asyncio
+import unittest
+
+import zope.component
+import zope.component.hooks
+import zope.interface
+from zope.site.folder import Folder
+from zope.site.site import LocalSiteManager
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import hooks
+from z3c.baseregistry.tests.fixtures import Example
+from z3c.baseregistry.tests.fixtures import IAdapted
+from z3c.baseregistry.tests.fixtures import IExample
+from z3c.baseregistry.tests.fixtures import adapter
+
+
+class TestHooks(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        hooks.setHooks()
+        self.gsm = zope.component.getGlobalSiteManager()
+        self.one = baseregistry.BaseComponents(self.gsm, 'one', (self.gsm,))
+        self.one.registerUtility(Example('one'), IExample)
+        self.one.registerAdapter(adapter)
+        self.two = baseregistry.BaseComponents(self.gsm, 'two', (self.gsm,))
+        self.two.registerUtility(Example('two'), IExample)
+
+    def test_hooksInstalled(self):
+        self.assertTrue(hooks.hooksInstalled())
+        hooks.resetHooks()
+        self.assertFalse(hooks.hooksInstalled())
+        zope.component.hooks.setHooks()
+        self.assertFalse(hooks.hooksInstalled())
+
+    def test_useRegistry(self):
+        self.assertIsNone(hooks.getActiveRegistry())
+        self.assertIs(self.gsm, zope.component.getSiteManager())
+        with hooks.useRegistry(self.one):
+            self.assertIs(self.one, hooks.getActiveRegistry())
+            self.assertIs(self.one, zope.component.getSiteManager())
+            self.assertEqual('one', zope.component.getUtility(IExample).name)
+            self.assertEqual('adapted', IAdapted(Example('other')))
+        self.assertIsNone(hooks.getActiveRegistry())
+        self.assertIsNone(zope.component.queryUtility(IExample))
+        self.assertIsNone(IAdapted(Example('other'), None))
+
+    def test_activateRegistry(self):
+        token = hooks.activateRegistry(self.two)
+        self.assertIs(self.two, zope.component.getSiteManager())
+        hooks.deactivateRegistry(token)
+        self.assertIs(self.gsm, zope.component.getSiteManager())
+
+    def test_site(self):
+        site = Folder()
+        site.setSiteManager(LocalSiteManager(site))
+        sm = site.getSiteManager()
+        sm.__bases__ = (self.two,)
+        with zope.component.hooks.site(site):
+            self.assertIs(sm, zope.component.getSiteManager())
+            self.assertEqual('two', zope.component.getUtility(IExample).name)
+            with hooks.useRegistry(self.one):
+                self.assertIs(self.one, zope.component.getSiteManager())
+                self.assertIs(sm, zope.component.getSiteManager(sm))
+
+    def test_tasks(self):
+        async def lookup(registry):
+            with hooks.useRegistry(registry):
+                names = []
+                for i in range(3):
+                    names.append(zope.component.getUtility(IExample).name)
+                    await asyncio.sleep(0)
+                return names
+
+        async def main():
+            return await asyncio.gather(lookup(self.one), lookup(self.two))
+
+        self.assertEqual([['one'] * 3, ['two'] * 3], asyncio.run(main()))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
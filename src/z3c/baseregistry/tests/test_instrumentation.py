@@ -0,0 +1,108 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import json
+import unittest
+
+import zope.component
+import zope.interface
+from zope.site.folder import Folder
+from zope.site.site import LocalSiteManager
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import instrumentation
+from z3c.baseregistry.tests.fixtures import Example
+from z3c.baseregistry.tests.fixtures import IAdapted
+from z3c.baseregistry.tests.fixtures import IExample
+from z3c.baseregistry.tests.fixtures import adapter
+from z3c.baseregistry.tests.fixtures import example
+
+
+class TestInstrumentation(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        gsm = zope.component.getGlobalSiteManager()
+        self.custom = baseregistry.BaseComponents(gsm, 'custom')
+        self.custom.registerUtility(example, IExample, 'example')
+        self.custom.registerAdapter(adapter)
+        self.stats = instrumentation.LookupStats()
+
+    def _entry(self, kind, iface, name=''):
+        entries = {(entry['kind'], entry['interface'], entry['name']): entry
+                   for entry in self.stats.asList()}
+        return entries[(kind, iface.__identifier__, name)]
+
+    def test_utility_lookups(self):
+        instrumentation.instrument(self.custom, self.stats)
+        self.assertIs(example, self.custom.getUtility(IExample, 'example'))
+        self.assertIsNone(self.custom.queryUtility(IExample, 'missing'))
+        self.assertIsNone(self.custom.queryUtility(IAdapted))
+
+        entry = self._entry('utility', IExample, 'example')
+        self.assertEqual(1, entry['lookups'])
+        self.assertEqual(1, entry['hits'])
+        self.assertEqual({'custom': 1}, entry['servedBy'])
+        self.assertEqual(1, entry['depth'])
+        entry = self._entry('utility', IExample, 'missing')
+        self.assertEqual(1, entry['misses'])
+        self.assertEqual({}, entry['servedBy'])
+
+    def test_adapter_lookups(self):
+        instrumentation.instrument(self.custom, self.stats)
+        self.assertEqual('adapted', self.custom.getAdapter(example, IAdapted))
+        self.assertEqual('adapted',
+                         self.custom.queryMultiAdapter((example,), IAdapted))
+        self.assertEqual('adapted',
+                         self.custom.adapters.adapter_hook(IAdapted, example))
+        self.assertIs(adapter, self.custom.adapters.lookup(
+            (zope.interface.implementedBy(Example),), IAdapted))
+        self.assertIsNone(
+            self.custom.queryMultiAdapter((example, example), IAdapted))
+        entry = self._entry('adapter', IAdapted)
+        self.assertEqual(5, entry['lookups'])
+        self.assertEqual(4, entry['hits'])
+        self.assertEqual(1, entry['misses'])
+
+    def test_local_site_manager(self):
+        site = Folder()
+        site.setSiteManager(LocalSiteManager(site))
+        sm = site.getSiteManager()
+        sm.__bases__ = (zope.component.getGlobalSiteManager(), self.custom)
+
+        instrumentation.instrument(sm, self.stats)
+        self.assertIs(example, sm.getUtility(IExample, 'example'))
+        self.assertFalse(sm.utilities._p_changed)
+
+        entry = self._entry('utility', IExample, 'example')
+        self.assertEqual({'custom': 1}, entry['servedBy'])
+        self.assertEqual(3, entry['depth'])
+
+    def test_json(self):
+        instrumentation.instrument(self.custom, self.stats)
+        self.custom.queryUtility(IExample, 'example')
+        data = json.loads(self.stats.toJSON())
+        self.assertEqual(1, len(data))
+        self.assertEqual(IExample.__identifier__, data[0]['interface'])
+
+    def test_uninstrument(self):
+        instrumentation.instrument(self.custom, self.stats)
+        instrumentation.uninstrument(self.custom)
+        self.custom.getUtility(IExample, 'example')
+        self.custom.getAdapter(example, IAdapted)
+        self.assertEqual([], self.stats.asList())
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -0,0 +1,141 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import gc
+import os
+import shutil
+import tempfile
+import unittest
+
+import zope.component
+import zope.component.hooks
+import zope.interface
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import prefork
+from z3c.baseregistry import profiling
+from z3c.baseregistry.tests.fixtures import CONFIGURE
+from z3c.baseregistry.tests.fixtures import Example
+from z3c.baseregistry.tests.fixtures import IAdapted
+from z3c.baseregistry.tests.fixtures import IExample
+from z3c.baseregistry.tests.fixtures import adapter
+from z3c.baseregistry.tests.fixtures import example
+
+
+custom = baseregistry.BaseComponents(
+    zope.component.globalSiteManager, 'preforkcustom')
+
+
+ZCML = CONFIGURE % '''
+  <utility
+      component="z3c.baseregistry.tests.test_prefork.custom"
+      provides="zope.interface.interfaces.IComponents"
+      name="preforkcustom" />
+
+  <adapter factory="z3c.baseregistry.tests.fixtures.adapter" />
+
+  <registerIn registry="z3c.baseregistry.tests.test_prefork.custom"
+              lazy="true">
+    <utility
+        component="z3c.baseregistry.tests.fixtures.example"
+        name="example" />
+  </registerIn>
+'''
+
+
+class TestPreload(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        zope.component.hooks.setHooks()
+        self.tmpdir = tempfile.mkdtemp()
+        self.zcml = os.path.join(self.tmpdir, 'site.zcml')
+        with open(self.zcml, 'w') as f:
+            f.write(ZCML)
+
+    def tearDown(self):
+        gc.unfreeze()
+        shutil.rmtree(self.tmpdir)
+        custom.__init__(zope.component.globalSiteManager, 'preforkcustom')
+        zope.component.hooks.resetHooks()
+        super().tearDown()
+
+    def _assertCached(self, registry, required, provided, name=''):
+        def uncached(*args):
+            raise AssertionError('Not cached: %r' % (args,))
+        registry._v_lookup._uncached_lookup = uncached
+        try:
+            return registry.lookup(required, provided, name)
+        finally:
+            del registry._v_lookup._uncached_lookup
+
+    def test_preload(self):
+        prefork.preload(self.zcml)
+        self.assertTrue(custom.populated)
+        self.assertTrue(custom.frozen)
+        self.assertIs(example, custom.getUtility(IExample, 'example'))
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+        gsm = zope.component.getGlobalSiteManager()
+        self.assertIs(adapter, self._assertCached(
+            gsm.adapters, (IExample,), IAdapted))
+        self.assertEqual('adapted', gsm.getAdapter(example, IAdapted))
+
+    def test_preload_without_freezing(self):
+        prefork.preload(self.zcml, freeze=False)
+        self.assertTrue(custom.populated)
+        self.assertFalse(custom.frozen)
+        self.assertIs(example, self._assertCached(
+            custom.utilities, (), IExample, 'example'))
+
+    def test_preload_lookups(self):
+        lookups = os.path.join(self.tmpdir, 'lookups.json')
+        with open(lookups, 'w') as f:
+            f.write('[{"kind": "adapter", "registry": "", "bases": [],'
+                    ' "required": [["class", "%s.Example"]],'
+                    ' "provided": "%s", "name": ""}]'
+                    % (__name__, IAdapted.__identifier__))
+        prefork.preload(self.zcml, lookups=lookups)
+        gsm = zope.component.getGlobalSiteManager()
+        self.assertIs(adapter, self._assertCached(
+            gsm.adapters, (zope.interface.implementedBy(Example),), IAdapted))
+
+    def test_preload_profile(self):
+        profile = profiling.ConfigurationProfile()
+        prefork.preload(self.zcml, profile=profile)
+        self.assertEqual(['preforkcustom'], [
+            entry['registry'] for entry in profile.getReport()['registries']])
+
+    def test_preload_registries(self):
+        prefork.preload(self.zcml, registries=[custom])
+        self.assertTrue(custom.frozen)
+        self.assertIs(example, custom.getUtility(IExample, 'example'))
+
+
+@unittest.skipUnless(os.path.exists('/proc/self/smaps_rollup'),
+                     'Requires Linux')
+class TestMemoryUsage(unittest.TestCase):
+
+    def test_memoryUsage(self):
+        usage = prefork.memoryUsage()
+        self.assertEqual({'rss', 'pss', 'shared', 'private'}, set(usage))
+        self.assertEqual(usage['rss'], usage['shared'] + usage['private'])
+
+    def test_other_process(self):
+        self.assertEqual(
+            set(prefork.memoryUsage()), set(prefork.memoryUsage(os.getpid())))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -0,0 +1,171 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import functools
+import json
+import unittest
+
+import zope.component
+import zope.component.zcml
+import zope.interface
+from zope.configuration import xmlconfig
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import profiling
+from z3c.baseregistry import zcml
+from z3c.baseregistry.tests.fixtures import CONFIGURE
+from z3c.baseregistry.tests.fixtures import IAdapted
+from z3c.baseregistry.tests.fixtures import IExample
+from z3c.baseregistry.tests.fixtures import example
+from z3c.baseregistry.tests.fixtures import handled
+from z3c.baseregistry.tests.fixtures import handler
+
+
+custom = baseregistry.BaseComponents(
+    zope.component.globalSiteManager, 'profilecustom')
+other = baseregistry.BaseComponents(
+    zope.component.globalSiteManager, 'profileother')
+
+
+CONFIGURATION = CONFIGURE % '''
+  <utility
+      component="z3c.baseregistry.tests.fixtures.example"
+      name="global" />
+
+  <registerIn registry="z3c.baseregistry.tests.test_profiling.custom
+                        z3c.baseregistry.tests.test_profiling.other">
+    <utility
+        component="z3c.baseregistry.tests.fixtures.example"
+        name="example" />
+    <adapter factory="z3c.baseregistry.tests.fixtures.adapter" />
+    <subscriber handler="z3c.baseregistry.tests.fixtures.handler" />
+  </registerIn>
+
+  <registerIn registry="z3c.baseregistry.tests.test_profiling.custom"
+              lazy="true">
+    <adapter
+        factory="z3c.baseregistry.tests.fixtures.adapter"
+        name="lazy" />
+  </registerIn>
+'''
+
+
+class TestProfile(CleanUp, unittest.TestCase):
+
+    def tearDown(self):
+        custom.__init__(zope.component.globalSiteManager, 'profilecustom')
+        other.__init__(zope.component.globalSiteManager, 'profileother')
+        del handled[:]
+        super().tearDown()
+
+    def _configure(self, profile):
+        context = zcml.ConfigurationMachine(profile=profile)
+        xmlconfig.registerCommonDirectives(context)
+        xmlconfig.string(CONFIGURATION, context=context)
+        return context
+
+    def test_report(self):
+        reports = []
+        profile = profiling.ConfigurationProfile(emit=reports.append)
+        self._configure(profile)
+        self.assertEqual([profile.getReport()], reports)
+        report = reports[0]
+
+        first, lazy = report['blocks']
+        self.assertEqual(['profilecustom', 'profileother'],
+                         first['registries'])
+        self.assertFalse(first['lazy'])
+        self.assertEqual('<string>', first['file'])
+        self.assertEqual(10, first['line'])
+        self.assertEqual(14, first['actions'])
+        self.assertEqual(
+            {'adapter': 2, 'handler': 2, 'interface': 8, 'utility': 2},
+            {kind: byType['actions']
+             for kind, byType in first['byType'].items()})
+        self.assertGreater(first['parseTime'], 0)
+        self.assertGreater(first['executeTime'], 0)
+        self.assertAlmostEqual(
+            first['executeTime'],
+            sum(byType['time'] for byType in first['byType'].values()))
+
+        self.assertTrue(lazy['lazy'])
+        self.assertEqual({'adapter': 1, 'interface': 2}, {
+            kind: byType['actions']
+            for kind, byType in lazy['byType'].items()})
+
+        registries = {entry['registry']: entry
+                      for entry in report['registries']}
+        self.assertEqual(['profilecustom', 'profileother'],
+                         sorted(registries))
+        self.assertEqual(2, registries['profilecustom']['blocks'])
+        self.assertEqual(10, registries['profilecustom']['actions'])
+        self.assertEqual(7, registries['profileother']['actions'])
+        self.assertAlmostEqual(
+            first['parseTime'] + lazy['parseTime'],
+            registries['profilecustom']['parseTime'])
+        self.assertGreater(registries['profileother']['resolveTime'], 0)
+        self.assertGreaterEqual(report['resolveTime'],
+                                registries['profileother']['resolveTime'])
+        self.assertGreater(report['executeTime'],
+                           registries['profileother']['executeTime'])
+
+        self.assertEqual(report, json.loads(profile.toJSON()))
+        self.assertIs(example, other.getUtility(IExample, 'example'))
+        self.assertEqual('adapted', custom.getAdapter(
+            example, IAdapted, 'lazy'))
+
+    def test_without_emit(self):
+        profile = profiling.ConfigurationProfile()
+        self._configure(profile)
+        self.assertEqual(2, len(profile.getReport()['blocks']))
+        profile.clear()
+        self.assertEqual(
+            {'blocks': [], 'registries': [], 'resolveTime': 0.0,
+             'executeTime': 0.0},
+            profile.getReport())
+
+    def test_disabled(self):
+        context = self._configure(None)
+        self.assertIsNone(context.profile)
+        self.assertIs(example, custom.getUtility(IExample, 'example'))
+        custom.handle(example)
+        self.assertEqual([example], handled)
+
+    def test_ProfilingActionsProxy(self):
+        profile = profiling.ConfigurationProfile()
+        block = profile.beginBlock((custom,))
+        actions = []
+        proxy = zcml.ProfilingActionsProxy(profile, block, actions, custom)
+        proxy.append({'discriminator': 'nothing', 'callable': None})
+        proxy.append({'discriminator': None,
+                      'callable': zope.component.zcml.handler,
+                      'args': ('registerUtility', example, IExample)})
+        self.assertEqual(2, len(actions))
+        self.assertEqual({'utility': {'actions': 1, 'time': 0.0}},
+                         block['byType'])
+
+    def test_getActionType(self):
+        self.assertEqual('subscriber', zcml.getActionType(
+            zcml.registryHandler, (custom, 'registerSubscriptionAdapter')))
+        self.assertEqual('registerOther', zcml.getActionType(
+            zcml.registryHandler, (custom, 'registerOther')))
+        self.assertEqual('handler', zcml.getActionType(
+            zcml.callInRegistry, (custom, handler)))
+        partial = functools.partial(handler)
+        self.assertEqual(repr(partial), zcml.getActionType(
+            zcml.callInRegistry, (custom, partial)))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -0,0 +1,197 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import os
+import shutil
+import tempfile
+import unittest
+
+import zope.component
+import zope.interface
+from zope.configuration import xmlconfig
+from zope.configuration.config import ConfigurationConflictError
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import reload
+from z3c.baseregistry.tests.fixtures import CONFIGURE
+from z3c.baseregistry.tests.fixtures import IAdapted
+from z3c.baseregistry.tests.fixtures import IExample
+from z3c.baseregistry.tests.fixtures import handled
+from z3c.baseregistry.tests.fixtures import one
+from z3c.baseregistry.tests.fixtures import three
+from z3c.baseregistry.tests.fixtures import two
+
+
+tenant = baseregistry.BaseComponents(
+    zope.component.globalSiteManager, 'reloadtenant')
+other = baseregistry.BaseComponents(
+    zope.component.globalSiteManager, 'reloadother')
+
+
+ZCML = CONFIGURE % '''
+  <utility
+      component="z3c.baseregistry.tests.fixtures.one"
+      provides="z3c.baseregistry.tests.fixtures.IExample"
+      name="global" />
+
+  <registerIn registry="z3c.baseregistry.tests.test_reload.tenant"%s>
+    %s
+  </registerIn>
+
+  <registerIn registry="z3c.baseregistry.tests.test_reload.other">
+    %s
+  </registerIn>
+'''
+
+ORIGINAL = '''
+    <utility
+        component="z3c.baseregistry.tests.fixtures.one"
+        provides="z3c.baseregistry.tests.fixtures.IExample"
+        name="one" />
+    <utility
+        component="z3c.baseregistry.tests.fixtures.two"
+        provides="z3c.baseregistry.tests.fixtures.IExample"
+        name="two" />
+    <adapter factory="z3c.baseregistry.tests.fixtures.adapter" />
+    <subscriber handler="z3c.baseregistry.tests.fixtures.handler" />
+'''
+
+CHANGED = '''
+    <utility
+        component="z3c.baseregistry.tests.fixtures.one"
+        provides="z3c.baseregistry.tests.fixtures.IExample"
+        name="one" />
+    <utility
+        component="z3c.baseregistry.tests.fixtures.three"
+        provides="z3c.baseregistry.tests.fixtures.IExample"
+        name="three" />
+    <utility
+        component="z3c.baseregistry.tests.fixtures.three"
+        provides="z3c.baseregistry.tests.fixtures.IExample"
+        name="two" />
+    <adapter
+        factory="z3c.baseregistry.tests.fixtures.adapter"
+        name="named" />
+    <subscriber handler="z3c.baseregistry.tests.fixtures.handler" />
+    <subscriber
+        handler="z3c.baseregistry.tests.fixtures.handler"
+        for="z3c.baseregistry.tests.fixtures.IAdapted" />
+'''
+
+OTHER = '''
+    <utility
+        component="z3c.baseregistry.tests.fixtures.two"
+        provides="z3c.baseregistry.tests.fixtures.IExample" />
+'''
+
+CONFLICT = '''
+    <utility
+        component="z3c.baseregistry.tests.fixtures.one"
+        provides="z3c.baseregistry.tests.fixtures.IExample" />
+    <utility
+        component="z3c.baseregistry.tests.fixtures.two"
+        provides="z3c.baseregistry.tests.fixtures.IExample" />
+'''
+
+
+class TestReload(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'site.zcml')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        gsm = zope.component.globalSiteManager
+        tenant.__init__(gsm, 'reloadtenant')
+        other.__init__(gsm, 'reloadother')
+        del handled[:]
+        super().tearDown()
+
+    def _write(self, tenant, other=OTHER, lazy=False):
+        with open(self.filename, 'w') as f:
+            f.write(ZCML % (' lazy="true"' if lazy else '', tenant, other))
+
+    def _configure(self, lazy=False):
+        self._write(ORIGINAL, lazy=lazy)
+        xmlconfig.file(self.filename)
+
+    def test_reloadRegistry(self):
+        self._configure()
+        registration = tenant._utility_registrations[(IExample, 'one')]
+        handlerRegistration = tenant._handler_registrations[0]
+        otherGeneration = other.utilities._generation
+        self.assertEqual('adapted', tenant.getAdapter(one, IAdapted))
+
+        self._write(CHANGED, other='')
+        reload.reloadRegistry(tenant, self.filename)
+
+        self.assertIs(one, tenant.getUtility(IExample, 'one'))
+        self.assertIs(three, tenant.getUtility(IExample, 'three'))
+        self.assertIs(three, tenant.getUtility(IExample, 'two'))
+        self.assertIsNone(tenant.queryAdapter(one, IAdapted))
+        self.assertEqual('adapted', tenant.getAdapter(one, IAdapted, 'named'))
+        self.assertIs(registration,
+                      tenant._utility_registrations[(IExample, 'one')])
+        self.assertIs(handlerRegistration, tenant._handler_registrations[0])
+        self.assertEqual(2, len(tenant._handler_registrations))
+        tenant.handle(one)
+        self.assertEqual([one], handled)
+
+        self.assertEqual(otherGeneration, other.utilities._generation)
+        self.assertIs(two, other.getUtility(IExample))
+        self.assertIsNone(tenant.queryUtility(IExample, 'global'))
+
+    def test_unchanged(self):
+        self._configure()
+        generations = (tenant.adapters._generation,
+                       tenant.utilities._generation)
+        reload.reloadRegistry(tenant, self.filename)
+        self.assertEqual(generations, (tenant.adapters._generation,
+                                       tenant.utilities._generation))
+
+    def test_conflict(self):
+        self._configure()
+        self._write(CONFLICT)
+        self.assertRaises(ConfigurationConflictError,
+                          reload.reloadRegistry, tenant, self.filename)
+        self.assertIs(two, tenant.getUtility(IExample, 'two'))
+
+    def test_lazy(self):
+        self._configure(lazy=True)
+        self.assertFalse(tenant.populated)
+        self._write(CHANGED, lazy=True)
+        reload.reloadRegistry(tenant, self.filename)
+        self.assertFalse(tenant.populated)
+        self.assertIs(three, tenant.getUtility(IExample, 'three'))
+        self.assertIs(three, tenant.getUtility(IExample, 'two'))
+
+    def test_lazy_populated(self):
+        self._configure(lazy=True)
+        tenant.populate()
+        self._write(CHANGED, lazy=True)
+        reload.reloadRegistry(tenant, self.filename)
+        self.assertIs(three, tenant.getUtility(IExample, 'three'))
+        self.assertIs(three, tenant.getUtility(IExample, 'two'))
+
+    def test_frozen(self):
+        self._configure()
+        tenant.freeze()
+        self.assertRaises(baseregistry.FrozenRegistryError,
+                          reload.reloadRegistry, tenant, self.filename)
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -0,0 +1,148 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import zope.component
+import zope.component.hooks
+import zope.interface
+from zope.interface.interfaces import IComponents
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import report
+from z3c.baseregistry.tests.fixtures import CONFIGURE
+from z3c.baseregistry.tests.fixtures import IAdapted
+from z3c.baseregistry.tests.fixtures import IExample
+from z3c.baseregistry.tests.fixtures import adapter
+from z3c.baseregistry.tests.fixtures import example
+from z3c.baseregistry.tests.fixtures import handler
+
+
+custom = baseregistry.BaseComponents(
+    zope.component.globalSiteManager, 'reportcustom')
+
+
+ZCML = CONFIGURE % '''
+  <utility
+      component="z3c.baseregistry.tests.test_report.custom"
+      provides="zope.interface.interfaces.IComponents"
+      name="reportcustom" />
+
+  <registerIn registry="z3c.baseregistry.tests.test_report.custom">
+    <utility
+        component="z3c.baseregistry.tests.fixtures.example"
+        name="example" />
+  </registerIn>
+'''
+
+
+class TestReport(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.gsm = zope.component.getGlobalSiteManager()
+        self.registry = baseregistry.BaseComponents(
+            self.gsm, 'registry', (self.gsm,))
+        self.gsm.registerUtility(self.registry, IComponents, 'registry')
+        self.registry.registerUtility(example, IExample, 'example')
+        self.registry.registerAdapter(adapter)
+        self.registry.registerSubscriptionAdapter(adapter)
+        self.registry.registerHandler(handler, (IExample,))
+
+    def test_getRegistryReport(self):
+        self.registry.getAdapter(example, IAdapted)
+        data = report.getRegistryReport(self.registry)
+        self.assertEqual('registry', data['name'])
+        self.assertEqual(1, data['utilities'])
+        self.assertEqual(1, data['adapters'])
+        self.assertEqual(1, data['subscribers'])
+        self.assertEqual(1, data['handlers'])
+        self.assertTrue(data['populated'])
+        self.assertEqual(['base'], data['bases'])
+        self.assertEqual({'required': 1, 'extendors': 2},
+                         data['caches']['adapters'])
+        self.assertGreater(data['size'], 0)
+
+    def test_frozen(self):
+        data = report.getRegistryReport(self.registry)
+        self.assertNotIn('table', data['caches']['utilities'])
+        self.registry.freeze()
+        data = report.getRegistryReport(self.registry)
+        self.assertGreater(data['caches']['utilities']['table'], 0)
+
+    def test_lazy(self):
+        lazy = baseregistry.BaseComponents(self.gsm, 'lazy')
+        lazy.defer(lazy.registerUtility, example, IExample)
+        data = report.getRegistryReport(lazy)
+        self.assertFalse(data['populated'])
+        self.assertNotIn('caches', data)
+        self.assertFalse(lazy.populated)
+
+    def test_getReport(self):
+        data = report.getReport()
+        self.assertEqual(['base', 'registry'],
+                         [entry['name'] for entry in data])
+        self.assertEqual(1, data[0]['utilities'])
+        json.dumps(data)
+
+    def test_getSize(self):
+        shared = ['shared']
+        self.assertLess(report.getSize([shared, shared]),
+                        report.getSize([shared, ['other']]))
+        self.assertEqual(sys.getsizeof([example]), report.getSize([example]))
+
+
+class TestMain(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        zope.component.hooks.setHooks()
+        self.tmpdir = tempfile.mkdtemp()
+        self.zcml = os.path.join(self.tmpdir, 'site.zcml')
+        with open(self.zcml, 'w') as f:
+            f.write(ZCML)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        custom.__init__(zope.component.globalSiteManager, 'reportcustom')
+        zope.component.hooks.resetHooks()
+        super().tearDown()
+
+    def test_print(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            report.main([self.zcml])
+        data = json.loads(output.getvalue())
+        self.assertEqual(['base', 'reportcustom'],
+                         [entry['name'] for entry in data])
+        # The provided interface is registered as a utility, too.
+        self.assertEqual(2, data[1]['utilities'])
+
+    def test_output(self):
+        filename = os.path.join(self.tmpdir, 'report.json')
+        report.main([self.zcml, '--output', filename])
+        with open(filename) as f:
+            data = json.load(f)
+        self.assertEqual(2, len(data))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -0,0 +1,216 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import zope.component
+import zope.component.hooks
+import zope.interface
+from zope.configuration import xmlconfig
+from zope.interface.interfaces import IComponents
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import snapshot
+from z3c.baseregistry.tests.fixtures import CONFIGURE
+from z3c.baseregistry.tests.fixtures import IAdapted
+from z3c.baseregistry.tests.fixtures import IExample
+from z3c.baseregistry.tests.fixtures import handler
+
+
+custom = baseregistry.BaseComponents(
+    zope.component.globalSiteManager, 'snapshotcustom')
+
+
+class Renamed:
+    """A class which is renamed after the snapshot was saved."""
+
+
+ZCML = CONFIGURE % '''
+  <utility
+      component="z3c.baseregistry.tests.test_snapshot.custom"
+      provides="zope.interface.interfaces.IComponents"
+      name="snapshotcustom" />
+
+  <registerIn registry="z3c.baseregistry.tests.test_snapshot.custom">
+    <utility
+        component="z3c.baseregistry.tests.fixtures.example"
+        provides="z3c.baseregistry.tests.fixtures.IExample"
+        name="example" />
+    <adapter
+        factory="z3c.baseregistry.tests.fixtures.adapter"
+        for="*"
+        provides="z3c.baseregistry.tests.fixtures.IAdapted" />
+    <subscriber
+        factory="z3c.baseregistry.tests.fixtures.adapter"
+        for="*"
+        provides="z3c.baseregistry.tests.fixtures.IAdapted" />
+    <subscriber
+        handler="z3c.baseregistry.tests.fixtures.handler"
+        for="*" />
+  </registerIn>
+'''
+
+
+class TestSnapshot(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        zope.component.hooks.setHooks()
+        self.tmpdir = tempfile.mkdtemp()
+        self.zcml = os.path.join(self.tmpdir, 'site.zcml')
+        self.cache = os.path.join(self.tmpdir, 'registries.snapshot')
+        with open(self.zcml, 'w') as f:
+            f.write(ZCML)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        custom.__init__(zope.component.globalSiteManager, 'snapshotcustom')
+        zope.component.hooks.resetHooks()
+        super().tearDown()
+
+    def _reset(self):
+        CleanUp().cleanUp()
+        custom.__init__(zope.component.globalSiteManager, 'snapshotcustom')
+
+    def _configure(self):
+        context = xmlconfig.file(self.zcml)
+        custom.__bases__ = (zope.component.globalSiteManager,)
+        return context
+
+    def test_fingerprint_changes_with_content(self):
+        before = snapshot.fingerprint([self.zcml])
+        with open(self.zcml, 'a') as f:
+            f.write('\n')
+        self.assertNotEqual(before, snapshot.fingerprint([self.zcml]))
+
+    def test_getPackageVersions(self):
+        versions = dict(snapshot.getPackageVersions())
+        self.assertEqual(sys.version, versions['Python'])
+        self.assertIn('zope.interface', versions)
+
+    def test_included_files(self):
+        context = self._configure()
+        self.assertIn(self.zcml, snapshot.getIncludedFiles(context))
+
+    def test_save_and_load(self):
+        context = self._configure()
+        snapshot.saveSnapshot(self.cache, context)
+        self._reset()
+
+        self.assertTrue(snapshot.loadSnapshot(self.cache, [custom]))
+        gsm = zope.component.getGlobalSiteManager()
+        self.assertIs(custom, gsm.getUtility(IComponents, 'snapshotcustom'))
+        self.assertEqual((gsm,), custom.__bases__)
+        self.assertEqual('example',
+                         custom.getUtility(IExample, 'example').name)
+        self.assertEqual('adapted', custom.getAdapter(object(), IAdapted))
+        self.assertIsNone(gsm.queryUtility(IExample, 'example'))
+        self.assertEqual(['adapted'], custom.subscribers((None,), IAdapted))
+        self.assertEqual([handler], [
+            reg.handler for reg in custom.registeredHandlers()])
+
+    def test_lazy(self):
+        with open(self.zcml, 'w') as f:
+            f.write(ZCML.replace(
+                'registry="z3c.baseregistry.tests.test_snapshot.custom"',
+                'registry="z3c.baseregistry.tests.test_snapshot.custom"'
+                ' lazy="true"'))
+        context = xmlconfig.file(self.zcml)
+        self.assertFalse(custom.populated)
+        snapshot.saveSnapshot(self.cache, context, [custom])
+        self.assertTrue(custom.populated)
+        self._reset()
+
+        self.assertTrue(snapshot.loadSnapshot(self.cache, [custom]))
+        self.assertEqual('example',
+                         custom.getUtility(IExample, 'example').name)
+        self.assertEqual([handler], [
+            reg.handler for reg in custom.registeredHandlers()])
+
+    def test_getRegistries(self):
+        self._configure()
+        gsm = zope.component.getGlobalSiteManager()
+        self.assertEqual([gsm, custom], snapshot.getRegistries())
+        other = baseregistry.BaseComponents(gsm, 'other')
+        self.assertEqual([other], snapshot.getRegistries(other))
+
+    def test_explicit_registries(self):
+        gsm = zope.component.getGlobalSiteManager()
+        context = self._configure()
+        snapshot.saveSnapshot(self.cache, context, [gsm, custom])
+        self._reset()
+        self.assertTrue(snapshot.loadSnapshot(self.cache, [gsm, custom]))
+        self.assertEqual('example',
+                         custom.getUtility(IExample, 'example').name)
+
+    def test_load_other_version(self):
+        with open(self.cache, 'wb') as f:
+            pickle.dump({'version': 0}, f)
+        self.assertFalse(snapshot.loadSnapshot(self.cache, [custom]))
+
+    def test_load_missing(self):
+        self.assertFalse(snapshot.loadSnapshot(self.cache, [custom]))
+
+    def test_load_outdated(self):
+        context = self._configure()
+        snapshot.saveSnapshot(self.cache, context)
+        self._reset()
+        with open(self.zcml, 'a') as f:
+            f.write('\n')
+
+        self.assertFalse(snapshot.loadSnapshot(self.cache, [custom]))
+        self.assertIsNone(custom.queryUtility(IExample, 'example'))
+
+    def test_load_other_packages(self):
+        context = self._configure()
+        snapshot.saveSnapshot(self.cache, context)
+        self._reset()
+        with mock.patch.object(snapshot, 'getPackageVersions',
+                               return_value=[('Python', 'other')]):
+            self.assertFalse(snapshot.loadSnapshot(self.cache, [custom]))
+
+    def test_load_renamed_class(self):
+        context = self._configure()
+        custom.registerUtility(Renamed(), IExample, 'renamed')
+        snapshot.saveSnapshot(self.cache, context)
+        self._reset()
+        with mock.patch.dict(globals()):
+            del globals()['Renamed']
+            self.assertFalse(snapshot.loadSnapshot(self.cache, [custom]))
+        self.assertIsNone(custom.queryUtility(IExample, 'example'))
+
+    def test_load_unknown_registry(self):
+        context = self._configure()
+        snapshot.saveSnapshot(self.cache, context)
+        self._reset()
+
+        self.assertFalse(snapshot.loadSnapshot(self.cache))
+        self.assertIsNone(zope.component.queryUtility(
+            IComponents, 'snapshotcustom'))
+
+    def test_duplicate_names(self):
+        other = baseregistry.BaseComponents(
+            zope.component.globalSiteManager, 'snapshotcustom')
+        with self.assertRaises(ValueError):
+            snapshot.loadSnapshot(self.cache, [custom, other])
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -0,0 +1,195 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import unittest
+
+import zope.component
+import zope.event
+import zope.interface
+from zope.interface.interfaces import IComponents
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import testing
+from z3c.baseregistry.tests.fixtures import Example
+from z3c.baseregistry.tests.fixtures import IAdapted
+from z3c.baseregistry.tests.fixtures import IExample
+from z3c.baseregistry.tests.fixtures import adapter
+from z3c.baseregistry.tests.fixtures import other
+
+
+class TestState(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.gsm = zope.component.getGlobalSiteManager()
+        self.custom = baseregistry.BaseComponents(
+            self.gsm, 'custom', (self.gsm,))
+        self.gsm.registerUtility(self.custom, IComponents, 'custom')
+        self.gsm.registerUtility(Example('global'), IExample, 'global')
+        self.one = Example('one')
+        self.custom.registerUtility(self.one, IExample)
+        self.custom.registerUtility(factory=lambda: Example('made'),
+                                    provided=IExample, name='made')
+        self.custom.registerAdapter(adapter)
+        self.custom.registerSubscriptionAdapter(adapter)
+        self.handled = []
+        self.custom.registerHandler(self.handle, (IExample,))
+        self.custom.registerHandler(self.handle, (IExample,))
+        self.state = testing.saveState()
+
+    def handle(self, event):
+        self.handled.append(event)
+
+    def _getRegistrations(self, components):
+        return {
+            'bases': components.__bases__,
+            'utilities': dict(components._utility_registrations),
+            'adapters': dict(components._adapter_registrations),
+            'subscribers': list(components._subscription_registrations),
+            'handlers': list(components._handler_registrations),
+        }
+
+    def _assertRestored(self):
+        self.assertEqual(
+            [(state['registry'], self._getRegistrations(state['registry']))
+             for state in self.state],
+            [(state['registry'], {
+                key: state[key] for key in (
+                    'bases', 'utilities', 'adapters', 'subscribers',
+                    'handlers')})
+             for state in self.state])
+        self.assertIs(self.one, self.custom.getUtility(IExample))
+        self.assertEqual('made', self.custom.getUtility(IExample, 'made').name)
+        self.assertEqual('global', self.custom.getUtility(
+            IExample, 'global').name)
+        self.assertEqual('adapted', self.custom.getAdapter(
+            Example('x'), IAdapted))
+        self.assertEqual(['adapted'], self.custom.subscribers(
+            (Example('x'),), IAdapted))
+        self.custom.handle(self.one)
+        self.assertEqual([self.one, self.one], self.handled)
+
+    def test_saveState(self):
+        self.assertEqual([self.gsm, self.custom],
+                         [state['registry'] for state in self.state])
+        self.assertNotIn('deferred', self.state[0])
+
+    def test_unchanged(self):
+        self.custom.getUtility(IExample)
+        generations = (self.custom.adapters._generation,
+                       self.custom.utilities._generation)
+        testing.restoreState(self.state)
+        self.assertEqual(generations, (self.custom.adapters._generation,
+                                       self.custom.utilities._generation))
+        self._assertRestored()
+
+    def test_reinitialized(self):
+        # The generations of the new adapter registries may be the saved
+        # ones again.
+        generations = self.state[1]['generations']
+        self.custom.__init__(self.gsm, 'custom', (self.gsm,))
+        (self.custom.adapters._generation,
+         self.custom.utilities._generation) = generations
+        testing.restoreState(self.state)
+        self._assertRestored()
+
+    def test_added(self):
+        self.gsm.registerUtility(
+            baseregistry.BaseComponents(self.gsm, 'new'), IComponents, 'new')
+        self.custom.registerUtility(Example('two'), IExample, 'two')
+        self.custom.registerAdapter(adapter, name='named')
+        self.custom.registerSubscriptionAdapter(other)
+        self.custom.registerHandler(self.handle, (IAdapted,))
+        testing.restoreState(self.state)
+        self.assertIsNone(self.custom.queryUtility(IExample, 'two'))
+        self.assertIsNone(self.custom.queryAdapter(
+            Example('x'), IAdapted, 'named'))
+        self.assertIsNone(self.gsm.queryUtility(IComponents, 'new'))
+        self._assertRestored()
+
+    def test_replaced(self):
+        self.custom.registerUtility(Example('replaced'), IExample)
+        self.custom.registerAdapter(other)
+        self.gsm.registerUtility(Example('replaced'), IExample, 'global')
+        self.assertEqual('other', self.custom.getAdapter(
+            Example('x'), IAdapted))
+        testing.restoreState(self.state)
+        self._assertRestored()
+
+    def test_removed(self):
+        self.custom.unregisterUtility(self.one, IExample)
+        self.custom.unregisterUtility(provided=IExample, name='made')
+        self.custom.unregisterAdapter(adapter)
+        self.custom.unregisterSubscriptionAdapter(adapter)
+        self.custom.unregisterHandler(self.handle, (IExample,))
+        self.custom.__bases__ = ()
+        testing.restoreState(self.state)
+        self._assertRestored()
+
+    def test_subscriptions_reordered(self):
+        self.custom.unregisterHandler(self.handle, (IExample,))
+        self.custom.registerHandler(self.handle, (IExample,))
+        self.custom.registerSubscriptionAdapter(other)
+        self.custom.unregisterSubscriptionAdapter(adapter)
+        self.custom.registerSubscriptionAdapter(adapter)
+        testing.restoreState(self.state)
+        self._assertRestored()
+
+    def test_no_events(self):
+        self.custom.registerUtility(Example('two'), IExample, 'two')
+        self.custom.unregisterUtility(self.one, IExample)
+        events = []
+        zope.event.subscribers.append(events.append)
+        try:
+            testing.restoreState(self.state)
+        finally:
+            zope.event.subscribers.remove(events.append)
+        self.assertEqual([], events)
+
+    def test_restore_twice(self):
+        self.custom.registerUtility(Example('two'), IExample)
+        testing.restoreState(self.state)
+        self.custom.registerUtility(Example('three'), IExample)
+        testing.restoreState(self.state)
+        self._assertRestored()
+
+
+class TestLazyState(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.gsm = zope.component.getGlobalSiteManager()
+        self.lazy = baseregistry.BaseComponents(self.gsm, 'lazy', (self.gsm,))
+        self.lazy.defer(self.lazy.registerUtility, Example('lazy'), IExample)
+        self.state = testing.saveState([self.lazy])
+
+    def test_unpopulated(self):
+        self.lazy.defer(self.lazy.registerAdapter, adapter)
+        testing.restoreState(self.state)
+        self.assertFalse(self.lazy.populated)
+        self.assertEqual(1, len(self.lazy._deferred))
+        self.assertIsNone(self.lazy.queryAdapter(Example('x'), IAdapted))
+
+    def test_populated(self):
+        self.lazy.registerAdapter(adapter)
+        self.assertTrue(self.lazy.populated)
+        testing.restoreState(self.state)
+        self.assertFalse(self.lazy.populated)
+        self.assertEqual((self.gsm,), self.lazy.__bases__)
+        self.assertEqual('lazy', self.lazy.getUtility(IExample).name)
+        self.assertIsNone(self.lazy.queryAdapter(Example('x'), IAdapted))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -0,0 +1,170 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import zope.component
+import zope.interface
+from zope.interface.declarations import Declaration
+from zope.interface.declarations import Implements
+from zope.interface.declarations import Provides
+from zope.interface.interfaces import IComponents
+from zope.site.folder import Folder
+from zope.site.site import LocalSiteManager
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
+from z3c.baseregistry import instrumentation
+from z3c.baseregistry import warmup
+from z3c.baseregistry.tests.fixtures import Example
+from z3c.baseregistry.tests.fixtures import IAdapted
+from z3c.baseregistry.tests.fixtures import IExample
+from z3c.baseregistry.tests.fixtures import adapter
+from z3c.baseregistry.tests.fixtures import example
+
+
+class TestWarmup(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'lookups.json')
+        self.gsm = zope.component.getGlobalSiteManager()
+        self.custom = baseregistry.BaseComponents(self.gsm, 'custom')
+        self.gsm.registerUtility(self.custom, IComponents, 'custom')
+        self.custom.registerUtility(example, IExample, 'example')
+        self.custom.registerAdapter(adapter)
+        site = Folder()
+        site.setSiteManager(LocalSiteManager(site))
+        self.sm = site.getSiteManager()
+        self.sm.__bases__ = (self.custom, self.gsm)
+        self.recorder = warmup.LookupRecorder()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        super().tearDown()
+
+    def _record(self):
+        instrumentation.instrument(self.custom, self.recorder)
+        instrumentation.instrument(self.sm, self.recorder)
+        self.custom.getUtility(IExample, 'example')
+        self.custom.getUtility(IExample, 'example')
+        self.sm.getAdapter(example, IAdapted)
+        self.custom.adapters.lookup((IExample,), IAdapted)
+        single = Example()
+        zope.interface.alsoProvides(single, IAdapted)
+        self.custom.queryAdapter(single, IAdapted, 'special')
+        self.custom.adapters.lookup((Declaration(IAdapted),), IAdapted)
+        self.custom.adapters.lookup(
+            (Provides(Example, Implements.named('single', IAdapted)),),
+            IAdapted)
+        instrumentation.uninstrument(self.custom)
+        instrumentation.uninstrument(self.sm)
+
+    def _assertCached(self, registry, required, provided, name=''):
+        def uncached(*args):
+            raise AssertionError('Not cached: %r' % (args,))
+        registry._v_lookup._uncached_lookup = uncached
+        try:
+            return registry.lookup(required, provided, name)
+        finally:
+            del registry._v_lookup._uncached_lookup
+
+    def test_record(self):
+        self._record()
+        self.assertEqual([{
+            'kind': 'adapter',
+            'registry': 'custom',
+            'bases': (),
+            'required': [['interface', IExample.__identifier__]],
+            'provided': IAdapted.__identifier__,
+            'name': '',
+        }, {
+            'kind': 'adapter',
+            'registry': 'custom',
+            'bases': (),
+            'required': [['provides', Example.__module__ + '.Example',
+                          [['interface', IAdapted.__identifier__]]]],
+            'provided': IAdapted.__identifier__,
+            'name': 'special',
+        }, {
+            'kind': 'adapter',
+            'registry': None,
+            'bases': ('custom', ''),
+            'required': [['class', Example.__module__ + '.Example']],
+            'provided': IAdapted.__identifier__,
+            'name': '',
+        }, {
+            'kind': 'utility',
+            'registry': 'custom',
+            'bases': (),
+            'required': [],
+            'provided': IExample.__identifier__,
+            'name': 'example',
+        }], self.recorder.asList())
+        self.recorder.clear()
+        self.assertEqual([], self.recorder.asList())
+
+    def test_replay(self):
+        self._record()
+        self.recorder.save(self.filename)
+        self.custom.utilities.changed(self.custom.utilities)
+        self.custom.adapters.changed(self.custom.adapters)
+        self.sm.adapters.changed(self.sm.adapters)
+
+        self.assertEqual({'replayed': 4, 'skipped': 0},
+                         warmup.replay(self.filename, [self.sm]))
+        self.assertIs(example, self._assertCached(
+            self.custom.utilities, (), IExample, 'example'))
+        self.assertIs(adapter, self._assertCached(
+            self.sm.adapters, (zope.interface.implementedBy(Example),),
+            IAdapted))
+        self.assertIs(adapter, self._assertCached(
+            self.custom.adapters, (IExample,), IAdapted))
+        self.assertIsNone(self._assertCached(
+            self.custom.adapters, (Provides(Example, IAdapted),), IAdapted,
+            'special'))
+
+    def test_replay_without_site_managers(self):
+        self._record()
+        self.recorder.save(self.filename)
+        self.assertEqual({'replayed': 3, 'skipped': 0},
+                         warmup.replay(self.filename))
+
+    def test_replay_unresolvable(self):
+        with open(self.filename, 'w') as f:
+            json.dump([{
+                'kind': 'utility',
+                'registry': 'missing',
+                'bases': [],
+                'required': [],
+                'provided': IExample.__identifier__,
+                'name': '',
+            }, {
+                'kind': 'adapter',
+                'registry': '',
+                'bases': [],
+                'required': [['class', __name__ + '.Missing']],
+                'provided': IAdapted.__identifier__,
+                'name': '',
+            }], f)
+        self.assertEqual({'replayed': 0, 'skipped': 2},
+                         warmup.replay(self.filename))
+
+
+def test_suite():
+    return unittest.defaultTestLoader.loadTestsFromName(__name__)
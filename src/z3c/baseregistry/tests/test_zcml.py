@@ -12,11 +12,48 @@
 #
 ##############################################################################
 
+import concurrent.futures
 import unittest
 
+import zope.component.hooks
+import zope.component.interface
+import zope.component.zcml
+import zope.interface
+from zope.configuration import xmlconfig
+from zope.configuration.config import ConfigurationConflictError
+from zope.configuration.config import ConfigurationExecutionError
+from zope.configuration.config import expand_action
+from zope.configuration.config import resolveConflicts
+from zope.configuration.exceptions import ConfigurationError
+from zope.interface.interfaces import IInterface
+from zope.testing.cleanup import CleanUp
+
+from z3c.baseregistry import baseregistry
 from z3c.baseregistry import zcml
 
 
+class IExample(zope.interface.Interface):
+    pass
+
+
+@zope.interface.implementer(IExample)
+class Example:
+    pass
+
+
+example = Example()
+
+
+def failing():
+    raise ValueError('failing')
+
+
+custom = baseregistry.BaseComponents(
+    zope.component.globalSiteManager, 'zcmlcustom')
+other = baseregistry.BaseComponents(
+    zope.component.globalSiteManager, 'zcmlother')
+
+
 class TestActionsProxy(unittest.TestCase):
 
     def _makeOne(self, list_=None):
@@ -57,6 +94,471 @@ class TestActionsProxy(unittest.TestCase):
         self.assertEqual(len(list_), len(proxy))
         self.assertEqual(1, len(proxy))
 
+    def test_handler_is_bound_to_registry(self):
+        list_, proxy = self._makeOne()
+        proxy.append({'discriminator': None,
+                      'callable': zope.component.zcml.handler,
+                      'args': ('registerUtility', example, IExample)})
+        self.assertIs(zcml.registryHandler, list_[0]['callable'])
+        self.assertEqual((self, 'registerUtility', example, IExample),
+                         list_[0]['args'])
+
+    def test_provideInterface_is_bound_to_registry(self):
+        list_, proxy = self._makeOne()
+        proxy.append({'discriminator': None,
+                      'callable': zope.component.interface.provideInterface,
+                      'args': ('', IExample)})
+        self.assertIs(zcml.provideInterface, list_[0]['callable'])
+        self.assertEqual((self, '', IExample), list_[0]['args'])
+
+    def test_other_callables_run_in_registry(self):
+        list_, proxy = self._makeOne()
+        proxy.append({'discriminator': None, 'callable': len, 'args': ()})
+        self.assertIs(zcml.callInRegistry, list_[0]['callable'])
+        self.assertEqual((self, len), list_[0]['args'])
+
+    def test_decorates_for_each_registry(self):
+        list_ = ['abc']
+        proxy = zcml.ActionsProxy(list_, custom, other)
+        proxy.append({'discriminator': 'foo'})
+        proxy.insert(0, {'discriminator': 'bar'})
+        proxy[-1] = {'discriminator': 'baz'}
+        self.assertEqual(['bar', 'bar', 'abc', 'foo', 'baz', 'baz'], [
+            action if action == 'abc' else action['discriminator'][1]
+            for action in list_])
+        self.assertEqual([custom, other], [
+            action['discriminator'][0] for action in list_[-2:]])
+
+
+class TestRegisterIn(CleanUp, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        zope.component.hooks.setHooks()
+        self.context = xmlconfig.string('''
+        <configure>
+          <include package="z3c.baseregistry" file="meta.zcml" />
+          <include package="zope.component" file="meta.zcml" />
+        </configure>
+        ''')
+
+    def tearDown(self):
+        custom.__init__(zope.component.globalSiteManager, 'zcmlcustom')
+        other.__init__(zope.component.globalSiteManager, 'zcmlother')
+        zope.component.hooks.resetHooks()
+        super().tearDown()
+
+    def _configure(self, execute=True):
+        return xmlconfig.string('''
+        <configure xmlns="http://namespaces.zope.org/zope">
+          <registerIn registry="z3c.baseregistry.tests.test_zcml.custom">
+            <utility
+                component="z3c.baseregistry.tests.test_zcml.example"
+                name="example" />
+          </registerIn>
+        </configure>
+        ''', context=self.context, execute=execute)
+
+    def test_no_site_switching_actions(self):
+        context = self._configure(execute=False)
+        callables = [action['callable'] for action in context.actions]
+        self.assertEqual([zcml.beginBulk,
+                          zcml.registryHandler,
+                          zcml.provideInterface,
+                          zcml.endBulk],
+                         callables)
+
+    def test_registers_without_touching_site(self):
+        setSite = zope.component.hooks.setSite
+        calls = []
+        zope.component.hooks.setSite = calls.append
+        try:
+            self._configure()
+        finally:
+            zope.component.hooks.setSite = setSite
+        self.assertEqual([], calls)
+        self.assertIs(example, custom.getUtility(IExample, 'example'))
+        self.assertIs(IExample, custom.getUtility(
+            IInterface, 'z3c.baseregistry.tests.test_zcml.IExample'))
+        self.assertIsNone(zope.component.queryUtility(IExample, 'example'))
+
+    def test_block_is_executed_in_bulk(self):
+        dependent = baseregistry.BaseComponents(
+            zope.component.globalSiteManager, 'dependent', (custom,))
+        generation = dependent.utilities._generation
+        self._configure()
+        self.assertEqual(0, custom.utilities._bulk)
+        self.assertEqual(generation + 1, dependent.utilities._generation)
+        self.assertIs(example, dependent.getUtility(IExample, 'example'))
+
+    def _makeMachine(self):
+        context = zcml.ConfigurationMachine()
+        xmlconfig.registerCommonDirectives(context)
+        xmlconfig.string('''
+        <configure>
+          <include package="z3c.baseregistry" file="meta.zcml" />
+          <include package="zope.component" file="meta.zcml" />
+        </configure>
+        ''', context=context)
+        return context
+
+    def test_failing_block_ends_bulk(self):
+        dependent = baseregistry.BaseComponents(
+            zope.component.globalSiteManager, 'dependent', (custom,))
+        generation = dependent.utilities._generation
+        context = self._makeMachine()
+        with self.assertRaises(ConfigurationExecutionError):
+            xmlconfig.string('''
+            <configure xmlns="http://namespaces.zope.org/zope">
+              <registerIn registry="z3c.baseregistry.tests.test_zcml.custom
+                                    z3c.baseregistry.tests.test_zcml.other">
+                <utility
+                    component="z3c.baseregistry.tests.test_zcml.example"
+                    name="example" />
+                <utility
+                    factory="z3c.baseregistry.tests.test_zcml.failing"
+                    provides="z3c.baseregistry.tests.test_zcml.IExample"
+                    name="failing" />
+              </registerIn>
+            </configure>
+            ''', context=context)
+        self.assertEqual([], context.bulks)
+        for registry in (custom, other):
+            self.assertEqual(0, registry.adapters._bulk)
+            self.assertEqual(0, registry.utilities._bulk)
+        self.assertEqual(generation + 1, dependent.utilities._generation)
+        self.assertIs(example, dependent.getUtility(IExample, 'example'))
+
+    def test_failing_configuration_keeps_other_bulks(self):
+        running = self._makeMachine()
+        zcml.beginBulk(custom, running.bulks)
+        context = self._makeMachine()
+        context.actions = [
+            expand_action(None, zcml.beginBulk, (other, context.bulks)),
+            expand_action(None, zcml.callInRegistry, (other, failing)),
+        ]
+        with self.assertRaises(ConfigurationExecutionError):
+            context.execute_actions()
+        self.assertEqual(0, other.utilities._bulk)
+        self.assertEqual([custom], running.bulks)
+        self.assertEqual(1, custom.utilities._bulk)
+        zcml.endBulk(custom, running.bulks)
+        self.assertEqual(0, custom.utilities._bulk)
+
+    def test_registry_without_bulk(self):
+        context = xmlconfig.string('''
+        <configure xmlns="http://namespaces.zope.org/zope">
+          <registerIn registry="zope.component.globalregistry.base">
+            <utility
+                component="z3c.baseregistry.tests.test_zcml.example"
+                name="example" />
+          </registerIn>
+        </configure>
+        ''', context=self.context, execute=False)
+        callables = [action['callable'] for action in context.actions]
+        self.assertEqual([zcml.registryHandler, zcml.provideInterface],
+                         callables)
+
+    def test_many_registries(self):
+        context = xmlconfig.string('''
+        <configure xmlns="http://namespaces.zope.org/zope">
+          <registerIn registry="z3c.baseregistry.tests.test_zcml.custom
+                                z3c.baseregistry.tests.test_zcml.other">
+            <utility
+                component="z3c.baseregistry.tests.test_zcml.example"
+                name="example" />
+          </registerIn>
+        </configure>
+        ''', context=self.context, execute=False)
+        self.assertEqual(
+            [zcml.beginBulk, zcml.beginBulk,
+             zcml.registryHandler, zcml.registryHandler,
+             zcml.provideInterface, zcml.provideInterface,
+             zcml.endBulk, zcml.endBulk],
+            [action['callable'] for action in context.actions])
+        context.execute_actions()
+        self.assertIs(example, custom.getUtility(IExample, 'example'))
+        self.assertIs(example, other.getUtility(IExample, 'example'))
+        self.assertIsNone(zope.component.queryUtility(IExample, 'example'))
+
+    def test_many_registries_lazy(self):
+        xmlconfig.string('''
+        <configure xmlns="http://namespaces.zope.org/zope">
+          <registerIn registry="z3c.baseregistry.tests.test_zcml.custom
+                                z3c.baseregistry.tests.test_zcml.other"
+                      lazy="true">
+            <utility
+                component="z3c.baseregistry.tests.test_zcml.example"
+                name="example" />
+          </registerIn>
+        </configure>
+        ''', context=self.context)
+        self.assertFalse(custom.populated)
+        self.assertFalse(other.populated)
+        self.assertIs(example, other.getUtility(IExample, 'example'))
+        self.assertFalse(custom.populated)
+
+    def test_single_registry_object(self):
+        directive = zcml.RegisterIn(self.context, custom)
+        self.assertIs(custom, directive.registry)
+        self.assertEqual((custom,), directive.registries)
+
+    def _configureLazy(self, extra=''):
+        return xmlconfig.string('''
+        <configure xmlns="http://namespaces.zope.org/zope">
+          <registerIn registry="z3c.baseregistry.tests.test_zcml.custom"
+                      lazy="true">
+            <utility
+                component="z3c.baseregistry.tests.test_zcml.example"
+                name="example" />
+          </registerIn>
+          %s
+        </configure>
+        ''' % extra, context=self.context)
+
+    def test_lazy_defers_registrations(self):
+        self._configureLazy()
+        self.assertFalse(custom.populated)
+        self.assertEqual(2, len(custom._deferred))
+        self.assertIs(example, custom.getUtility(IExample, 'example'))
+        self.assertTrue(custom.populated)
+        self.assertIs(IExample, custom.getUtility(
+            IInterface, 'z3c.baseregistry.tests.test_zcml.IExample'))
+
+    def test_lazy_populated_when_used_as_base(self):
+        self._configureLazy()
+        dependent = baseregistry.BaseComponents(
+            zope.component.globalSiteManager, 'dependent')
+        self.assertFalse(custom.populated)
+        dependent.__bases__ = (custom,)
+        self.assertTrue(custom.populated)
+        self.assertIs(example, dependent.getUtility(IExample, 'example'))
+
+    def test_lazy_with_dependents(self):
+        dependent = baseregistry.BaseComponents(
+            zope.component.globalSiteManager, 'dependent', (custom,))
+        self._configureLazy()
+        self.assertTrue(custom.populated)
+        self.assertIs(example, dependent.queryUtility(IExample, 'example'))
+
+    def test_lazy_conflicts(self):
+        from zope.configuration.config import ConfigurationConflictError
+        with self.assertRaises(ConfigurationConflictError):
+            self._configureLazy('''
+              <registerIn registry="z3c.baseregistry.tests.test_zcml.custom">
+                <utility
+                    component="z3c.baseregistry.tests.test_zcml.Example"
+                    provides="z3c.baseregistry.tests.test_zcml.IExample"
+                    name="example" />
+              </registerIn>
+            ''')
+        self.assertTrue(custom.populated)
+
+    def test_lazy_requires_base_registry(self):
+        from zope.configuration.exceptions import ConfigurationError
+        with self.assertRaises(ConfigurationError):
+            xmlconfig.string('''
+            <configure xmlns="http://namespaces.zope.org/zope">
+              <registerIn registry="zope.component.globalregistry.base"
+                          lazy="true" />
+            </configure>
+            ''', context=self.context)
+
+    def test_registry_required(self):
+        with self.assertRaises(ConfigurationError) as error:
+            xmlconfig.string('''
+            <configure xmlns="http://namespaces.zope.org/zope">
+              <registerIn registry="" />
+            </configure>
+            ''', context=self.context)
+        self.assertIn("Invalid value for 'registry'", str(error.exception))
+
+    def test_provideInterface(self):
+        class IExampleType(IInterface):
+            pass
+
+        zcml.provideInterface(custom, 'example', IExample, IExampleType)
+        self.assertIs(IExample, custom.getUtility(IExampleType, 'example'))
+        self.assertTrue(IExampleType.providedBy(IExample))
+        with self.assertRaises(TypeError):
+            zcml.provideInterface(custom, '', IExample, IExample)
+
+    def test_provideInterface_class(self):
+        zcml.provideInterface(custom, '', Example)
+        self.assertEqual([], list(custom.registeredUtilities()))
+        with self.assertRaises(TypeError):
+            zcml.provideInterface(custom, 'example', example)
+
+    def test_setActiveRegistry(self):
+        zcml.setActiveRegistry(self, custom)
+        self.assertIs(custom, zope.component.getSiteManager())
+        zcml.resetOriginalRegistry(self)
+        self.assertIsNone(zope.component.hooks.getSite())
+
+    def test_callInRegistry(self):
+        def register():
+            zope.component.getSiteManager().registerUtility(example)
+        zcml.callInRegistry(custom, register)
+        self.assertIs(example, custom.getUtility(IExample))
+        self.assertIsNone(zope.component.hooks.getSite())
+
+    def test_callInRegistry_with_hooks(self):
+        from z3c.baseregistry import hooks
+        hooks.setHooks()
+
+        def register():
+            self.assertIsNone(zope.component.hooks.getSite())
+            zope.component.getSiteManager().registerUtility(example)
+        zcml.callInRegistry(custom, register)
+        self.assertIs(example, custom.getUtility(IExample))
+        self.assertIsNone(hooks.getActiveRegistry())
+
+    def test_setActiveRegistry_with_hooks(self):
+        from z3c.baseregistry import hooks
+        hooks.setHooks()
+        zcml.setActiveRegistry(self, custom)
+        self.assertIs(custom, zope.component.getSiteManager())
+        self.assertIsNone(zope.component.hooks.getSite())
+        zcml.resetOriginalRegistry(self)
+        self.assertIsNone(hooks.getActiveRegistry())
+
+    def test_configure_with_hooks(self):
+        from z3c.baseregistry import hooks
+        hooks.setHooks()
+        xmlconfig.string('''
+        <configure xmlns="http://namespaces.zope.org/zope">
+          <registerIn registry="z3c.baseregistry.tests.test_zcml.custom">
+            <interface
+                interface="z3c.baseregistry.tests.test_zcml.IExample"
+                name="example" />
+          </registerIn>
+        </configure>
+        ''', context=self.context)
+        self.assertIs(IExample, custom.getUtility(IInterface, 'example'))
+
+
+def fail(error):
+    raise error
+
+
+CONFIGURATION = '''
+<configure xmlns="http://namespaces.zope.org/zope">
+  <include package="z3c.baseregistry" file="meta.zcml" />
+  <include package="zope.component" file="meta.zcml" />
+
+  <utility
+      component="z3c.baseregistry.tests.test_zcml.example"
+      name="example" />
+
+  <registerIn registry="z3c.baseregistry.tests.test_zcml.custom">
+    <utility
+        component="z3c.baseregistry.tests.test_zcml.example"
+        name="example" />
+    <interface interface="z3c.baseregistry.tests.test_zcml.IExample" />
+  </registerIn>
+
+  <registerIn registry="z3c.baseregistry.tests.test_zcml.other">
+    <utility
+        component="z3c.baseregistry.tests.test_zcml.example"
+        name="example" />
+  </registerIn>
+  %s
+</configure>
+'''
+
+CONFLICT = '''
+  <registerIn registry="z3c.baseregistry.tests.test_zcml.custom">
+    <utility
+        component="z3c.baseregistry.tests.test_zcml.Example"
+        provides="z3c.baseregistry.tests.test_zcml.IExample"
+        name="example" />
+  </registerIn>
+'''
+
+
+class TestResolveConflicts(CleanUp, unittest.TestCase):
+
+    def tearDown(self):
+        custom.__init__(zope.component.globalSiteManager, 'zcmlcustom')
+        other.__init__(zope.component.globalSiteManager, 'zcmlother')
+        super().tearDown()
+
+    def _getActions(self, extra=''):
+        return xmlconfig.string(
+            CONFIGURATION % extra, execute=False).actions
+
+    def _action(self, discriminator, includepath=(), order=0, info=None):
+        return expand_action(discriminator, includepath=includepath,
+                             order=order, info=info)
+
+    def test_same_result(self):
+        actions = self._getActions()
+        self.assertEqual(resolveConflicts(actions),
+                         zcml.resolveConflicts(actions))
+
+    def test_executor(self):
+        actions = self._getActions()
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            self.assertEqual(resolveConflicts(actions),
+                             zcml.resolveConflicts(actions, executor))
+
+    def test_same_conflicts(self):
+        actions = self._getActions(CONFLICT)
+        with self.assertRaises(ConfigurationConflictError) as expected:
+            resolveConflicts(actions)
+        with self.assertRaises(ConfigurationConflictError) as error:
+            zcml.resolveConflicts(actions)
+        self.assertEqual(str(expected.exception), str(error.exception))
+
+    def test_overrides(self):
+        actions = [
+            self._action((custom, 'a'), ('x', 'y'), info='overridden'),
+            self._action((custom, 'a'), ('x',), info='override'),
+            self._action((other, 'a'), ('x', 'y'), order=-1, info='other'),
+            self._action((custom, None), info='no registry'),
+            self._action('a', info='global'),
+            (None, None, (), {}, (), 'tuple'),
+        ]
+        self.assertEqual(
+            resolveConflicts(actions), zcml.resolveConflicts(actions))
+        self.assertEqual(
+            ['other', 'override', 'no registry', 'global', 'tuple'],
+            [action['info'] for action in zcml.resolveConflicts(actions)])
+
+    def test_ConfigurationMachine(self):
+        context = zcml.ConfigurationMachine()
+        xmlconfig.registerCommonDirectives(context)
+        xmlconfig.string(CONFIGURATION % '', context=context)
+        self.assertEqual([], context.actions)
+        self.assertIs(example, custom.getUtility(IExample, 'example'))
+        self.assertIs(example, other.getUtility(IExample, 'example'))
+
+        context = zcml.ConfigurationMachine()
+        xmlconfig.registerCommonDirectives(context)
+        with self.assertRaises(ConfigurationConflictError):
+            xmlconfig.string(CONFIGURATION % CONFLICT, context=context)
+
+    def test_execute_errors(self):
+        context = zcml.ConfigurationMachine()
+        context.actions = [expand_action('no callable')]
+        context.execute_actions(clear=False)
+        self.assertEqual(1, len(context.actions))
+
+        context.actions = [
+            expand_action(None, fail, (ConfigurationError('bad'),),
+                          info='info')]
+        with self.assertRaises(ConfigurationError) as error:
+            context.execute_actions()
+        self.assertIn('info', str(error.exception))
+        self.assertEqual([], context.actions)
+
+        context.actions = [
+            expand_action(None, fail, (ValueError('bad'),), info='info')]
+        self.assertRaises(ConfigurationExecutionError,
+                          context.execute_actions, clear=False)
+        self.assertEqual(1, len(context.actions))
+        self.assertRaises(ValueError, context.execute_actions, testing=True)
+
 
 def test_suite():
     return unittest.defaultTestLoader.loadTestsFromName(__name__)
@@ -0,0 +1,152 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Recording lookups and replaying them to warm up the lookup caches.
+
+Record the lookups of running registries with ``instrument()``::
+
+  recorder = warmup.LookupRecorder()
+  instrumentation.instrument(registry, recorder)
+  ...
+  recorder.save('lookups.json')
+
+and replay them at startup, after the configuration was executed::
+
+  warmup.replay('lookups.json')
+
+"""
+__docformat__ = "reStructuredText"
+import json
+
+from zope.configuration.name import resolve
+from zope.interface.declarations import Implements
+from zope.interface.declarations import Provides
+from zope.interface.declarations import ProvidesClass
+from zope.interface.declarations import implementedBy
+from zope.interface.interface import InterfaceClass
+
+from z3c.baseregistry.baseregistry import BR
+from z3c.baseregistry.baseregistry import getReferenceId
+
+
+def _dumpSpec(spec):
+    if isinstance(spec, InterfaceClass):
+        return ['interface', spec.__identifier__]
+    if isinstance(spec, Implements) and isinstance(spec.inherit, type):
+        cls = spec.inherit
+        return ['class', f'{cls.__module__}.{cls.__qualname__}']
+    if isinstance(spec, ProvidesClass):
+        # The class and the interfaces provided directly by an object, as
+        # passed to ``Provides()``.
+        cls, *interfaces = spec.__reduce__()[1]
+        interfaces = [_dumpSpec(iface) for iface in interfaces]
+        if None in interfaces:
+            return None
+        return ['provides', f'{cls.__module__}.{cls.__qualname__}',
+                interfaces]
+    # Other declarations cannot be replayed.
+    return None
+
+
+def _loadSpec(data):
+    kind, name = data[:2]
+    if kind == 'interface':
+        return resolve(name)
+    if kind == 'provides':
+        return Provides(resolve(name), *map(_loadSpec, data[2]))
+    return implementedBy(resolve(name))
+
+
+class LookupRecorder:
+    """A lookup listener recording the distinct lookups.
+
+    Lookups are recorded for global registries by the id their pickles
+    reference them with, see ``getReferenceId()``.  For other registries the
+    ids of their bases are recorded instead.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._lookups = set()
+
+    def record(self, kind, registry, required, provided, name, elapsed):
+        components = registry.__parent__
+        id = getReferenceId(components)
+        bases = ()
+        if id is None:
+            bases = tuple(getReferenceId(base)
+                          for base in components.__bases__)
+        self._lookups.add((kind, id, bases, required, provided, name))
+
+    def asList(self):
+        """Return the recorded lookups as a list of plain dicts.
+
+        Lookups which cannot be replayed are omitted.
+        """
+        lookups = []
+        for kind, id, bases, required, provided, name in self._lookups:
+            required = [_dumpSpec(spec) for spec in required]
+            if None in required or None in bases:
+                continue
+            lookups.append({
+                'kind': kind,
+                'registry': id,
+                'bases': bases,
+                'required': required,
+                'provided': provided.__identifier__,
+                'name': name,
+            })
+        return sorted(lookups, key=lambda lookup: json.dumps(lookup))
+
+    def save(self, filename):
+        with open(filename, 'w') as f:
+            json.dump(self.asList(), f, indent=1)
+
+
+def replay(filename, siteManagers=()):
+    """Repeat recorded lookups to fill the lookup caches.
+
+    Lookups recorded for the bases of registries without a reference id are
+    repeated in all given site managers with the same bases.  Return the
+    number of replayed lookups and of lookups that could not be resolved.
+    """
+    with open(filename) as f:
+        lookups = json.load(f)
+
+    byBases = {}
+    for sm in siteManagers:
+        bases = tuple(getReferenceId(base) for base in sm.__bases__)
+        byBases.setdefault(bases, []).append(sm)
+
+    stats = {'replayed': 0, 'skipped': 0}
+    for lookup in lookups:
+        try:
+            required = tuple(_loadSpec(data) for data in lookup['required'])
+            provided = resolve(lookup['provided'])
+            if lookup['registry'] is not None:
+                targets = [BR(lookup['registry'])]
+            else:
+                targets = byBases.get(tuple(lookup['bases']), ())
+        except (ImportError, LookupError, AttributeError):
+            stats['skipped'] += 1
+            continue
+        for components in targets:
+            if lookup['kind'] == 'utility':
+                registry = components.utilities
+            else:
+                registry = components.adapters
+            registry.lookup(required, provided, lookup['name'])
+            stats['replayed'] += 1
+    return stats
@@ -15,34 +15,71 @@
 
 """
 __docformat__ = "reStructuredText"
+import contextvars
+import functools
+import operator
+import sys
+import time
+
 import zope.component.globalregistry
 import zope.component.hooks
+import zope.component.interface
+import zope.component.zcml
 import zope.configuration.config
 import zope.configuration.fields
 import zope.interface
+from zope.configuration.config import ConfigurationConflictError
+from zope.configuration.config import ConfigurationExecutionError
 from zope.configuration.exceptions import ConfigurationError
+from zope.interface.interfaces import IComponents
+from zope.interface.interfaces import IInterface
+
+from z3c.baseregistry import hooks
 
 
 class IRegisterInDirective(zope.interface.Interface):
     """Use the specified registry for registering the contained components."""
 
-    registry = zope.configuration.fields.GlobalObject(
+    registry = zope.configuration.fields.Tokens(
         title="Registry",
-        description="Python path to the registry to use.",
+        description=(
+            "Python paths to the registries to use. The contained"
+            " components are registered in each of them."),
+        value_type=zope.configuration.fields.GlobalObject(),
+        min_length=1,
         required=True)
 
+    lazy = zope.configuration.fields.Bool(
+        title="Lazy",
+        description=(
+            "Execute the registrations only when the registry is first used"
+            " for a lookup or as base of another registry."),
+        required=False,
+        default=False)
+
 
 class ActionsProxy:
-    """A proxy object for the actions list to decorate the incoming actions."""
+    """A proxy object for the actions list to decorate the incoming actions.
+
+    Each incoming action is added once for every registry.
+    """
 
     original = None
     registry = None
+    registries = ()
+    lazy = False
 
-    def __init__(self, original, registry):
+    def __init__(self, original, *registries, lazy=False):
         self.original = original
-        self.registry = registry
+        self.registry = registries[0]
+        self.registries = registries
+        self.lazy = lazy
 
-    def __decorate(self, action):
+    def _decorate(self, action):
+        return [self.__decorateFor(dict(action), registry)
+                for registry in self.registries]
+
+    def __decorateFor(self, action, registry):
         # handle action dict
         # (was a tuple before 2.0, see zope.configuration 3.8 for changes)
         # discriminator is a tuple like:
@@ -55,28 +92,46 @@ class ActionsProxy:
         if discriminator is not None:
             # replace the first part from the existing descriminator tuple
             # with our registry
-            action['discriminator'] = (self.registry, discriminator)
+            action['discriminator'] = (registry, discriminator)
+        # bind the callable to our registry, so that executing the action
+        # does not need to make the registry the active site manager
+        callable = action.get('callable', None)
+        if callable is not None:
+            args = action.get('args', ())
+            if callable is zope.component.zcml.handler:
+                action['callable'] = registryHandler
+            elif callable is zope.component.interface.provideInterface:
+                action['callable'] = provideInterface
+            else:
+                action['callable'] = callInRegistry
+                args = (callable,) + tuple(args)
+            action['args'] = (registry,) + tuple(args)
+            if self.lazy:
+                # conflicts are still detected, only the execution is deferred
+                action['args'] = (action['callable'],) + action['args']
+                action['callable'] = registry.defer
         return action
 
     def __setitem__(self, i, item):
         if isinstance(i, slice):
-            item = [self.__decorate(x) for x in item]
+            item = [x for action in item for x in self._decorate(action)]
         else:
-            item = self.__decorate(item)
+            i = slice(i, i + 1 or None)
+            item = self._decorate(item)
         self.original.__setitem__(i, item)
 
     def __iadd__(self, other):
-        other = [self.__decorate(item) for item in other]
+        other = [x for action in other for x in self._decorate(action)]
         self.original.__iadd__(other)
 
     def append(self, item):
-        self.original.append(self.__decorate(item))
+        self.original.extend(self._decorate(item))
 
     def insert(self, i, item):
-        self.original.insert(i, self.__decorate(item))
+        self.original[i:i] = self._decorate(item)
 
     def extend(self, other):
-        other = [self.__decorate(item) for item in other]
+        other = [x for action in other for x in self._decorate(action)]
         self.original.extend(other)
 
     def __len__(self):
@@ -86,6 +141,48 @@ class ActionsProxy:
         return getattr(self.original, name)
 
 
+# Action types of the registry methods called by ``zope.component.zcml``
+_ACTION_TYPES = {
+    'registerUtility': 'utility',
+    'registerAdapter': 'adapter',
+    'registerSubscriptionAdapter': 'subscriber',
+    'registerHandler': 'handler',
+}
+
+
+def getActionType(callable, args):
+    """Return the type of an action bound to a registry by ``ActionsProxy``.
+    """
+    if callable is registryHandler:
+        return _ACTION_TYPES.get(args[1], args[1])
+    if callable is provideInterface:
+        return 'interface'
+    callable = args[1]
+    return getattr(callable, '__name__', None) or repr(callable)
+
+
+class ProfilingActionsProxy(ActionsProxy):
+    """An actions proxy recording the decorated actions in a profile."""
+
+    def __init__(self, profile, block, original, *registries, lazy=False):
+        super().__init__(original, *registries, lazy=lazy)
+        self.profile = profile
+        self.block = block
+
+    def _decorate(self, action):
+        actions = super()._decorate(action)
+        for registry, decorated in zip(self.registries, actions):
+            callable = decorated.get('callable')
+            if callable is None:
+                continue
+            args = decorated['args']
+            if self.lazy:
+                callable, args = args[0], args[1:]
+            self.profile.addAction(self.block, registry, decorated,
+                                   getActionType(callable, args))
+        return actions
+
+
 class FakeBaseRegistrySite:
     """This a minimal fake Site, the only responsibility it has
     is to store our registry as a SiteManager and return it later.
@@ -99,13 +196,80 @@ class FakeBaseRegistrySite:
         return self.sm
 
 
+def beginBulk(registry, bulks=None):
+    """Begin the bulk operation of a ``registerIn`` block.
+
+    ``bulks`` is the list of the open bulk operations of the configuration
+    machine, if it keeps one.
+    """
+    registry.beginBulk()
+    if bulks is not None:
+        bulks.append(registry)
+
+
+def endBulk(registry, bulks=None):
+    """End the bulk operation of a ``registerIn`` block."""
+    if bulks is not None:
+        bulks.remove(registry)
+    registry.endBulk()
+
+
+def registryHandler(registry, methodName, *args, **kwargs):
+    """Execute a ``zope.component.zcml.handler`` action in the registry."""
+    getattr(registry, methodName)(*args, **kwargs)
+
+
+def provideInterface(registry, id, interface, iface_type=None, info=''):
+    """Register an interface as a utility of the registry.
+
+    This is ``zope.component.interface.provideInterface`` bound to the
+    registry instead of the current site manager.
+    """
+    if not id:
+        id = f"{interface.__module__}.{interface.__name__}"
+
+    if not IInterface.providedBy(interface):
+        if not isinstance(interface, type):
+            raise TypeError(id, "is not an interface or class")
+        return
+
+    if iface_type is not None:
+        if not iface_type.extends(IInterface):
+            raise TypeError(iface_type, "is not an interface type")
+        zope.interface.alsoProvides(interface, iface_type)
+    else:
+        iface_type = IInterface
+
+    registry.registerUtility(interface, iface_type, id, info)
+
+
+def callInRegistry(registry, callable, *args, **kwargs):
+    """Execute any other action with the registry as active site manager."""
+    if hooks.hooksInstalled():
+        with hooks.useRegistry(registry):
+            callable(*args, **kwargs)
+        return
+    original = zope.component.hooks.getSite()
+    zope.component.hooks.setSite(FakeBaseRegistrySite(registry))
+    try:
+        callable(*args, **kwargs)
+    finally:
+        zope.component.hooks.setSite(original)
+
+
 def setActiveRegistry(context, registry):
+    if hooks.hooksInstalled():
+        context.original = hooks.activateRegistry(registry)
+        return
     context.original = zope.component.hooks.getSite()
     fakeSite = FakeBaseRegistrySite(registry)
     zope.component.hooks.setSite(fakeSite)
 
 
 def resetOriginalRegistry(context):
+    if isinstance(context.original, contextvars.Token):
+        hooks.deactivateRegistry(context.original)
+        return
     zope.component.hooks.setSite(context.original)
 
 
@@ -117,25 +281,226 @@ class RegisterIn(zope.configuration.config.GroupingContextDecorator):
     # Storage for the original site
     original = None
 
-    def __init__(self, context, registry, **kw):
+    # The profile entry of the block, if the configuration is profiled
+    block = None
+
+    # The open bulk operations of the configuration machine, if it keeps
+    # them
+    bulks = None
+
+    def __init__(self, context, registry, lazy=False, **kw):
         if hasattr(context, 'registryChanged') and context.registryChanged:
             raise ConfigurationError(
                 'Nested ``registerIn`` directives are not permitted.')
+        if not isinstance(registry, (list, tuple)):
+            registry = [registry]
+        if lazy and not all(hasattr(r, 'defer') for r in registry):
+            raise ConfigurationError(
+                'Only base registries can be populated lazily.')
 
         super().__init__(context, **kw)
-        self.registry = registry
-        self.actions = ActionsProxy(context.actions, registry)
+        self.registry = registry[0]
+        self.registries = tuple(registry)
+        self.lazy = lazy
+        self.bulks = getattr(context, 'bulks', None)
+        profile = getattr(context, 'profile', None)
+        if profile is None:
+            self.actions = ActionsProxy(context.actions, *registry, lazy=lazy)
+        else:
+            self.block = profile.beginBlock(self.registries, lazy)
+            self.actions = ProfilingActionsProxy(
+                profile, self.block, context.actions, *registry, lazy=lazy)
 
     def before(self):
-        self.context.action(
-            discriminator=None,
-            callable=setActiveRegistry,
-            args=(self, self.registry)
-        )
+        # Defer invalidating dependent registries until the end of the block;
+        # lazy registries are populated in bulk anyway.
+        if self.lazy:
+            return
+        for registry in self.registries:
+            if hasattr(registry, 'beginBulk'):
+                self.context.action(
+                    discriminator=None,
+                    callable=beginBulk,
+                    args=(registry, self.bulks),
+                )
 
     def after(self):
-        self.context.action(
-            discriminator=None,
-            callable=resetOriginalRegistry,
-            args=(self,)
-        )
+        if self.block is not None:
+            self.profile.endBlock(self.block, self.registries, self.info)
+        if self.lazy:
+            return
+        for registry in self.registries:
+            if hasattr(registry, 'endBulk'):
+                self.context.action(
+                    discriminator=None,
+                    callable=endBulk,
+                    args=(registry, self.bulks),
+                )
+
+
+def _partitionActions(actions):
+    # Group the actions by discriminator, separately for every registry
+    # ``ActionsProxy`` prefixed the discriminators with; all other actions
+    # go into the ``None`` partition.  Actions with equal discriminators
+    # always end up in the same partition.
+    partitions = {None: ([], {})}
+    isRegistry = {}
+    for i, action in enumerate(actions):
+        if not isinstance(action, dict):
+            # old-style tuple action
+            action = zope.configuration.config.expand_action(*action)
+        discriminator = action['discriminator']
+        ainfo = (action['includepath'], action['order'] or 0, i, action)
+        if discriminator is None:
+            partitions[None][0].append(ainfo)
+            continue
+        registry = None
+        if (type(discriminator) is tuple and len(discriminator) == 2
+                and discriminator[1] is not None):
+            first = discriminator[0]
+            try:
+                registry = isRegistry[first]
+            except KeyError:
+                registry = isRegistry[first] = (
+                    first if IComponents.providedBy(first) else None)
+        if registry is None:
+            key = discriminator
+        else:
+            key = discriminator[1]
+        partition = partitions.get(registry)
+        if partition is None:
+            partition = partitions[registry] = ([], {})
+        partition[1].setdefault(key, []).append(ainfo)
+    return partitions
+
+
+def _resolvePartition(partition):
+    """Resolve the conflicts among the actions of one partition.
+
+    Return the remaining ``(order, i, action)`` tuples and the conflicts.
+    This follows ``zope.configuration.config.resolveConflicts()``.
+    """
+    output, unique = partition
+    conflicts = {}
+    for ainfos in unique.values():
+        # The shortest include path with a given prefix comes first; ``i``
+        # is unique, so the actions themselves are never compared.
+        if len(ainfos) > 1:
+            ainfos.sort(key=_byPath)
+        ainfo = ainfos[0]
+        output.append(ainfo)
+        basepath, _, _, action = ainfo
+        for includepath, _, _, other in ainfos[1:]:
+            if (includepath[:len(basepath)] != basepath
+                    or includepath == basepath):
+                infos = conflicts.setdefault(
+                    action['discriminator'], [action['info']])
+                infos.append(other['info'])
+    return output, conflicts
+
+
+_byPath = operator.itemgetter(0, 1, 2)
+
+
+def _resolveProfiled(profile, item):
+    registry, partition = item
+    start = time.perf_counter()
+    result = _resolvePartition(partition)
+    profile.recordResolution(registry, time.perf_counter() - start)
+    return result
+
+
+def resolveConflicts(actions, executor=None, profile=None):
+    """Resolve conflicting actions separately for each registry.
+
+    The result and the reported conflicts are the same as the ones of
+    ``zope.configuration.config.resolveConflicts()``.  The actions of the
+    ``registerIn`` blocks cannot conflict with the actions for other
+    registries, so they are resolved per registry.  With an ``executor``,
+    like a ``concurrent.futures.ThreadPoolExecutor``, the partitions are
+    resolved on its workers.  A ``profiling.ConfigurationProfile`` records
+    the time spent for each registry.
+    """
+    start = time.perf_counter()
+    partitions = _partitionActions(actions)
+    if profile is None:
+        resolve, partitions = _resolvePartition, partitions.values()
+    else:
+        resolve = functools.partial(_resolveProfiled, profile)
+        partitions = partitions.items()
+    if executor is None:
+        results = map(resolve, partitions)
+    else:
+        results = executor.map(resolve, partitions)
+
+    output = []
+    conflicts = {}
+    for resolved, partitionConflicts in results:
+        output.extend(resolved)
+        conflicts.update(partitionConflicts)
+    if conflicts:
+        raise ConfigurationConflictError(conflicts)
+
+    output.sort(key=_byOrder)
+    if profile is not None:
+        profile.resolveTime += time.perf_counter() - start
+    return [ainfo[3] for ainfo in output]
+
+
+_byOrder = operator.itemgetter(1, 2)
+
+
+class ConfigurationMachine(zope.configuration.config.ConfigurationMachine):
+    """A configuration machine resolving conflicts per registry.
+
+    Use it as the context of ``zope.configuration.xmlconfig.file()``; see
+    ``resolveConflicts()``.  With a ``profiling.ConfigurationProfile`` the
+    ``registerIn`` blocks, the conflict resolution and the execution of the
+    actions are profiled.  When an action fails, the machine ends the bulk
+    operations of the ``registerIn`` blocks in progress.
+    """
+
+    def __init__(self, executor=None, profile=None):
+        super().__init__()
+        self.executor = executor
+        self.profile = profile
+        # The registries whose ``registerIn`` block began a bulk operation
+        # that did not end yet
+        self.bulks = []
+
+    def execute_actions(self, clear=True, testing=False):
+        # This follows ``ConfigurationMachine.execute_actions()``.
+        pass_through_exceptions = self.pass_through_exceptions
+        if testing:
+            pass_through_exceptions = BaseException
+        profile = self.profile
+        try:
+            for action in resolveConflicts(
+                    self.actions, self.executor, profile):
+                callable = action['callable']
+                if callable is None:
+                    continue
+                if profile is not None:
+                    callable = profile.timed(action)
+                args = action['args']
+                kw = action['kw']
+                info = action['info']
+                try:
+                    callable(*args, **kw)
+                except ConfigurationError as ex:
+                    ex.add_details(info)
+                    raise
+                except pass_through_exceptions:
+                    raise
+                except Exception:
+                    # Wrap it up and raise.
+                    raise ConfigurationExecutionError(info, sys.exc_info()[1])
+        finally:
+            # The actions ending the bulk operations of a failing block
+            # never run.
+            while self.bulks:
+                self.bulks.pop().endBulk()
+            if clear:
+                del self.actions[:]
+        if profile is not None:
+            profile.finish()